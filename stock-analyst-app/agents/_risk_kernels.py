@@ -0,0 +1,130 @@
+"""
+Numeric kernels for risk metrics, compiled with Numba when it is available.
+"""
+
+import logging
+import numpy as np
+
+logger = logging.getLogger(__name__)
+
+# Safe import with fallback to plain Python loops
+try:
+    from numba import njit, types
+    NUMBA_AVAILABLE = True
+    # Inputs may be read-only (pandas copy-on-write arrays), so declare those variants too
+    _F8_ARRAYS = tuple(
+        types.Array(types.float64, 1, layout, readonly=readonly)
+        for readonly in (False, True)
+        for layout in ('C', 'A')
+    )
+    _MAX_DRAWDOWN_SIGNATURES = [types.float64(a) for a in _F8_ARRAYS]
+    _RISK_SUMMARY_SIGNATURES = [types.Tuple((types.int64,) + (types.float64,) * 5)(a) for a in _F8_ARRAYS]
+except ImportError as e:
+    logger.warning(f"Numba not available, risk kernels will run uncompiled: {e}")
+    NUMBA_AVAILABLE = False
+    _MAX_DRAWDOWN_SIGNATURES = _RISK_SUMMARY_SIGNATURES = []
+
+    def njit(*args, **kwargs):
+        """No-op stand-in for numba.njit."""
+        if len(args) == 1 and callable(args[0]) and not kwargs:
+            return args[0]
+        return lambda func: func
+
+
+# Kernels declare their signature so Numba compiles them eagerly at import
+# (and loads them from the on-disk cache afterwards) instead of on first call.
+@njit(_MAX_DRAWDOWN_SIGNATURES, cache=True, fastmath=True)
+def max_drawdown(r):
+    """Maximum drawdown of a daily returns array in a single pass.
+
+    The peak starts at the first cumulative value, not at 1.0, matching risk_summary.
+    """
+    cum = 1.0
+    peak = 1.0
+    mdd = 0.0
+    for i in range(r.size):
+        cum *= (1.0 + r[i])
+        if i == 0 or cum > peak:
+            peak = cum
+        dd = (cum - peak) / peak
+        if dd < mdd:
+            mdd = dd
+    return mdd
+
+
+@njit(cache=True)
+def _percentile_linear(sorted_at, n, q):
+    """np.percentile-style linear interpolation, given an array partitioned around the needed ranks."""
+    pos = q / 100.0 * (n - 1)
+    lo = int(np.floor(pos))
+    hi = min(lo + 1, n - 1)
+    return sorted_at[lo] + (pos - lo) * (sorted_at[hi] - sorted_at[lo])
+
+
+# No fastmath here: it would let the compiler drop the NaN checks.
+@njit(_RISK_SUMMARY_SIGNATURES, cache=True)
+def _risk_summary_jit(close):
+    """Single fused pass: Welford mean/variance, running drawdown, then one partition for VaR."""
+    n = close.size - 1
+    returns = np.empty(max(n, 0))
+    count = 0
+    mean = 0.0
+    m2 = 0.0
+    cum = 1.0
+    peak = 1.0
+    mdd = 0.0
+    for i in range(n):
+        r = close[i + 1] / close[i] - 1.0
+        if np.isnan(r):
+            continue
+        returns[count] = r
+        count += 1
+
+        # Welford's running mean / variance
+        delta = r - mean
+        mean += delta / count
+        m2 += delta * (r - mean)
+
+        # Running drawdown from the highest cumulative value so far
+        cum *= 1.0 + r
+        if count == 1 or cum > peak:
+            peak = cum
+        dd = (cum - peak) / peak
+        if dd < mdd:
+            mdd = dd
+
+    if count < 2:
+        return count, np.nan, np.nan, np.nan, np.nan, np.nan
+
+    lo99 = int(np.floor(0.01 * (count - 1)))
+    lo95 = int(np.floor(0.05 * (count - 1)))
+    kth = np.array([lo99, min(lo99 + 1, count - 1), lo95, min(lo95 + 1, count - 1)])
+    part = np.partition(returns[:count], kth)
+    var_99 = _percentile_linear(part, count, 1.0)
+    var_95 = _percentile_linear(part, count, 5.0)
+
+    return count, mean, np.sqrt(m2 / (count - 1)), var_95, var_99, mdd
+
+
+def _risk_summary_numpy(close):
+    """NumPy equivalent of _risk_summary_jit, used when Numba is not installed."""
+    returns = np.diff(close) / close[:-1]
+    returns = returns[~np.isnan(returns)]
+    count = returns.size
+    if count < 2:
+        return count, np.nan, np.nan, np.nan, np.nan, np.nan
+
+    var_99, var_95 = np.percentile(returns, [1, 5])
+
+    # Drawdown in log space: an additive cumsum replaces the cumprod chain and the
+    # (cum - peak) / peak division; expm1 maps the deepest log drop back to a simple return
+    log_cumulative = np.cumsum(np.log1p(returns))
+    log_peak = np.maximum.accumulate(log_cumulative)
+    max_drawdown = np.expm1((log_cumulative - log_peak).min())
+
+    return count, returns.mean(), returns.std(ddof=1), var_95, var_99, max_drawdown
+
+
+# risk_summary(close) -> (data_points, daily mean, daily std, VaR 95, VaR 99, max drawdown)
+# computed from a float64 array of daily closes, skipping NaN returns.
+risk_summary = _risk_summary_jit if NUMBA_AVAILABLE else _risk_summary_numpy
@@ -216,19 +216,27 @@ class DataCollectorAgent:
                 hist = ticker.history(period=period)
             
             if not hist.empty:
+                # Extract each column once instead of building a Series per row with iterrows
+                dates = hist.index.strftime('%Y-%m-%d').tolist()
+                opens, highs, lows, closes = (
+                    hist[column].to_numpy(dtype=float).tolist()
+                    for column in ('Open', 'High', 'Low', 'Close')
+                )
+                volumes = hist['Volume'].to_numpy(dtype='int64').tolist()
+                
                 return {
                     "symbol": symbol,
                     "period": period,
                     "data": [
                         {
-                            "date": str(date.date()),
-                            "open": float(row['Open']),
-                            "high": float(row['High']),
-                            "low": float(row['Low']),
-                            "close": float(row['Close']),
-                            "volume": int(row['Volume'])
+                            "date": d,
+                            "open": o,
+                            "high": h,
+                            "low": l,
+                            "close": c,
+                            "volume": v
                         }
-                        for date, row in hist.iterrows()
+                        for d, o, h, l, c, v in zip(dates, opens, highs, lows, closes, volumes)
                     ],
                     "source": "yfinance",
                     "timestamp": datetime.now().isoformat()
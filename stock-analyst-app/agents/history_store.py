@@ -0,0 +1,80 @@
+"""
+Shared cache of daily price history and the returns derived from it.
+"""
+
+import logging
+import threading
+import time
+from typing import Any, Callable, Dict, Optional, Tuple
+import numpy as np
+import pandas as pd
+
+class HistoryStore:
+    """Caches price history per (symbol, period) so returns are computed once and reused."""
+
+    def __init__(self, loader: Callable[[str, str], Optional[pd.DataFrame]], ttl: float = 300.0):
+        """
+        Args:
+            loader: Callable returning a date-indexed OHLCV DataFrame for (symbol, period)
+            ttl: Seconds before a cached history is reloaded
+        """
+        self.logger = logging.getLogger(__name__)
+        self.loader = loader
+        self.ttl = ttl
+        self._entries: Dict[Tuple[str, str], Dict[str, Any]] = {}
+        # One lock per (symbol, period), so concurrent callers wait for a single load instead of each fetching
+        self._locks_guard = threading.Lock()
+        self._key_locks: Dict[Tuple[str, str], threading.Lock] = {}
+
+    def _get_entry(self, symbol: str, period: str) -> Optional[Dict[str, Any]]:
+        """Return the cached entry for (symbol, period), loading it if missing or expired."""
+        key = (symbol, period)
+        entry = self._entries.get(key)
+        if entry and time.monotonic() - entry['loaded_at'] < self.ttl:
+            return entry
+
+        with self._locks_guard:
+            key_lock = self._key_locks.setdefault(key, threading.Lock())
+
+        with key_lock:
+            # Another thread may have loaded it while this one waited
+            entry = self._entries.get(key)
+            if entry and time.monotonic() - entry['loaded_at'] < self.ttl:
+                return entry
+            return self._load_entry(key, symbol, period)
+
+    def _load_entry(self, key: Tuple[str, str], symbol: str, period: str) -> Optional[Dict[str, Any]]:
+        """Load (symbol, period) through the loader and cache it; the caller holds the key's lock."""
+        df = self.loader(symbol, period)
+        if df is None or df.empty:
+            return None
+
+        closes = df['Close'].to_numpy(dtype=np.float64)
+        entry = {
+            'loaded_at': time.monotonic(),
+            'history': df,
+            'returns': np.diff(closes) / closes[:-1],
+            'return_dates': df.index[1:]
+        }
+        self._entries[key] = entry
+        return entry
+
+    def history(self, symbol: str, period: str) -> Optional[pd.DataFrame]:
+        """Daily OHLCV history indexed by date."""
+        entry = self._get_entry(symbol, period)
+        return entry['history'] if entry else None
+
+    def closes(self, symbol: str, period: str) -> Optional[pd.Series]:
+        """Daily closing prices indexed by date."""
+        entry = self._get_entry(symbol, period)
+        return entry['history']['Close'] if entry else None
+
+    def returns(self, symbol: str, period: str) -> Optional[np.ndarray]:
+        """Simple daily returns as a float64 array, aligned with return_dates()."""
+        entry = self._get_entry(symbol, period)
+        return entry['returns'] if entry else None
+
+    def return_dates(self, symbol: str, period: str) -> Optional[pd.DatetimeIndex]:
+        """Dates of the daily returns (the history index without its first day)."""
+        entry = self._get_entry(symbol, period)
+        return entry['return_dates'] if entry else None
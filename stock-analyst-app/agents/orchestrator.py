@@ -1,3 +1,4 @@
+import asyncio
 import boto3
 import json
 import logging
@@ -9,6 +10,9 @@ from agents.risk_agent import RiskAgent
 from agents.intelligent_search_agent import IntelligentSearchAgent
 from datetime import datetime
 
+# Cap on concurrent per-symbol agent calls, to stay under Yahoo rate limits
+MAX_CONCURRENT_AGENT_CALLS = 16
+
 class Orchestrator:
     """Main orchestrator agent that coordinates all other agents and uses Claude Sonnet 3.5 for final recommendations."""
     
@@ -61,6 +65,50 @@ class Orchestrator:
             self.logger.error(f"Portfolio analysis failed: {str(e)}")
             raise
     
+    async def analyze_portfolio_async(self, symbols: List[str]) -> List[Dict[str, Any]]:
+        """
+        Same pipeline as analyze_portfolio, but the per-symbol agent calls run concurrently.
+        
+        The agents are synchronous, so each call runs in a worker thread; the total
+        latency becomes that of the slowest call rather than the sum of all of them.
+        
+        Args:
+            symbols: List of stock symbols to analyze
+            
+        Returns:
+            List of recommendation dictionaries
+        """
+        try:
+            self.logger.info(f"Starting concurrent portfolio analysis for: {symbols}")
+            loop = asyncio.get_running_loop()
+            semaphore = asyncio.Semaphore(MAX_CONCURRENT_AGENT_CALLS)
+            
+            async def run(func, *args):
+                async with semaphore:
+                    return await loop.run_in_executor(None, func, *args)
+            
+            stock_results, risk_results, news_data = await asyncio.gather(
+                asyncio.gather(*(run(self.data_collector.get_stock_data, symbol) for symbol in symbols)),
+                asyncio.gather(*(run(self.risk_agent.analyze_volatility, symbol) for symbol in symbols)),
+                run(self._collect_news_data, symbols)
+            )
+            
+            stock_data = {symbol: data for symbol, data in zip(symbols, stock_results) if data}
+            risk_data = {symbol: data for symbol, data in zip(symbols, risk_results) if data}
+            self.logger.info(f"Collected data for {len(stock_data)} stocks and risk data for {len(risk_data)} stocks")
+            
+            # Generate recommendations using Claude Sonnet 3.5
+            recommendations = await loop.run_in_executor(
+                None, self._generate_recommendations, stock_data, news_data, risk_data
+            )
+            
+            self.logger.info(f"Generated {len(recommendations)} recommendations")
+            return recommendations
+            
+        except Exception as e:
+            self.logger.error(f"Portfolio analysis failed: {str(e)}")
+            raise
+    
     def _collect_stock_data(self, symbols: List[str]) -> Dict[str, Any]:
         """Collect stock data for all symbols."""
         try:
@@ -1,11 +1,14 @@
 import requests
 import json
+import orjson
 import logging
 import numpy as np
 import pandas as pd
 from typing import Dict, Any, Optional, List
 from datetime import datetime, timedelta
 from config import Config
+from agents._risk_kernels import max_drawdown as kernel_max_drawdown
+from agents.history_store import HistoryStore
 import yfinance as yf
 
 class RiskAgent:
@@ -15,6 +18,7 @@ class RiskAgent:
         self.logger = logging.getLogger(__name__)
         self.mcp_url = f"http://localhost:{Config.MCP_DB_PORT}"
         self.session = requests.Session()
+        self.history = HistoryStore(self._get_historical_data)
     
     def analyze_volatility(self, symbol: str, period: str = "1mo") -> Optional[Dict[str, Any]]:
         """
@@ -56,12 +60,12 @@ class RiskAgent:
                 timeout=30
             )
             
-            if response.status_code == 200:
-                data = response.json()
-                if 'result' in data:
-                    return data['result']
+            # Error bodies are never used, so don't parse them
+            if response.status_code != 200:
+                return None
             
-            return None
+            data = orjson.loads(response.content)
+            return data.get('result')
             
         except Exception as e:
             self.logger.warning(f"MCP DB server call failed for {symbol}: {str(e)}")
@@ -70,32 +74,26 @@ class RiskAgent:
     def _calculate_risk_metrics(self, symbol: str, period: str) -> Optional[Dict[str, Any]]:
         """Calculate risk metrics directly using historical data."""
         try:
-            # Get historical data
-            historical_data = self._get_historical_data(symbol, period)
-            if not historical_data:
+            # Daily closes and returns are computed once and shared via the history store
+            prices = self.history.closes(symbol, period)
+            daily_returns = self.history.returns(symbol, period)
+            if prices is None or daily_returns is None:
                 return None
             
-            df = pd.DataFrame(historical_data)
-            df['date'] = pd.to_datetime(df['date'])
-            df.set_index('date', inplace=True)
-            
-            # Calculate daily returns
-            df['returns'] = df['close'].pct_change()
-            daily_returns = df['returns'].dropna()
-            
-            if len(daily_returns) < 10:  # Need sufficient data
+            if daily_returns.size < 10:  # Need sufficient data
                 return None
             
             # Calculate risk metrics
-            risk_metrics = self._compute_risk_metrics(daily_returns, df['close'])
+            beta = self._calculate_beta(symbol, period)
+            risk_metrics = self._compute_risk_metrics(daily_returns, prices, beta)
             
             # Add metadata
             risk_metrics.update({
                 'symbol': symbol,
                 'period': period,
-                'data_points': len(daily_returns),
-                'start_date': df.index[0].isoformat(),
-                'end_date': df.index[-1].isoformat(),
+                'data_points': int(daily_returns.size),
+                'start_date': prices.index[0].isoformat(),
+                'end_date': prices.index[-1].isoformat(),
                 'analysis_timestamp': datetime.now().isoformat()
             })
             
@@ -105,9 +103,14 @@ class RiskAgent:
             self.logger.error(f"Error calculating risk metrics for {symbol}: {str(e)}")
             return None
     
-    def _get_historical_data(self, symbol: str, period: str) -> Optional[List[Dict]]:
-        """Get historical price data."""
+    def _get_historical_data(self, symbol: str, period: str) -> Optional[pd.DataFrame]:
+        """Get historical OHLCV data indexed by (timezone-naive) trading date."""
         try:
+            # Market indices (e.g. ^NSEI) are fetched as-is
+            if symbol.startswith('^'):
+                hist = yf.Ticker(symbol).history(period=period)
+                return self._normalize_history(hist) if not hist.empty else None
+            
             # Try with .NS suffix first (NSE)
             yf_symbol = f"{symbol}.NS"
             ticker = yf.Ticker(yf_symbol)
@@ -120,17 +123,7 @@ class RiskAgent:
                 hist = ticker.history(period=period)
             
             if not hist.empty:
-                return [
-                    {
-                        'date': str(date.date()),
-                        'open': float(row['Open']),
-                        'high': float(row['High']),
-                        'low': float(row['Low']),
-                        'close': float(row['Close']),
-                        'volume': int(row['Volume'])
-                    }
-                    for date, row in hist.iterrows()
-                ]
+                return self._normalize_history(hist)
             
             return None
             
@@ -138,12 +131,19 @@ class RiskAgent:
             self.logger.warning(f"Failed to get historical data for {symbol}: {str(e)}")
             return None
     
-    def _compute_risk_metrics(self, returns: pd.Series, prices: pd.Series) -> Dict[str, Any]:
+    def _normalize_history(self, hist: pd.DataFrame) -> pd.DataFrame:
+        """Index a yfinance history by plain trading dates so NSE/BSE and index data align."""
+        if hist.index.tz is not None:
+            hist.index = hist.index.tz_localize(None)
+        hist.index = hist.index.normalize()
+        return hist
+    
+    def _compute_risk_metrics(self, returns: np.ndarray, prices: pd.Series, beta: Optional[float]) -> Dict[str, Any]:
         """Compute comprehensive risk metrics."""
         try:
             # Basic statistics
             mean_return = float(returns.mean())
-            std_return = float(returns.std())
+            std_return = float(returns.std(ddof=1))
             
             # Volatility (annualized)
             volatility = float(std_return * np.sqrt(252))  # 252 trading days
@@ -156,19 +156,14 @@ class RiskAgent:
             cvar_95 = float(returns[returns <= var_95].mean())
             cvar_99 = float(returns[returns <= var_99].mean())
             
-            # Maximum Drawdown
-            cumulative_returns = (1 + returns).cumprod()
-            rolling_max = cumulative_returns.expanding().max()
-            drawdowns = (cumulative_returns - rolling_max) / rolling_max
-            max_drawdown = float(drawdowns.min())
+            # Maximum Drawdown (single fused pass over the returns)
+            max_drawdown = float(kernel_max_drawdown(returns))
             
             # Sharpe Ratio (assuming risk-free rate of 6% for India)
             risk_free_rate = 0.06 / 252  # Daily risk-free rate
             excess_returns = returns - risk_free_rate
-            sharpe_ratio = float(excess_returns.mean() / excess_returns.std()) if excess_returns.std() != 0 else 0
-            
-            # Beta calculation (using NIFTY as market proxy)
-            beta = self._calculate_beta(returns)
+            excess_std = excess_returns.std(ddof=1)
+            sharpe_ratio = float(excess_returns.mean() / excess_std) if excess_std != 0 else 0
             
             # Price-based metrics
             current_price = float(prices.iloc[-1])
@@ -202,26 +197,26 @@ class RiskAgent:
             self.logger.error(f"Error computing risk metrics: {str(e)}")
             return {}
     
-    def _calculate_beta(self, stock_returns: pd.Series) -> Optional[float]:
+    def _calculate_beta(self, symbol: str, period: str) -> Optional[float]:
         """Calculate beta relative to market (NIFTY)."""
         try:
-            # Get NIFTY data for the same period
-            nifty_ticker = yf.Ticker("^NSEI")
-            nifty_hist = nifty_ticker.history(period="1mo")
+            # Get NIFTY returns for the same period
+            stock_returns = self.history.returns(symbol, period)
+            nifty_returns = self.history.returns("^NSEI", period)
             
-            if nifty_hist.empty:
+            if stock_returns is None or nifty_returns is None:
                 return None
             
-            nifty_returns = nifty_hist['Close'].pct_change().dropna()
-            
             # Align dates
-            common_dates = stock_returns.index.intersection(nifty_returns.index)
+            stock_dates = self.history.return_dates(symbol, period)
+            nifty_dates = self.history.return_dates("^NSEI", period)
+            common_dates = stock_dates.intersection(nifty_dates)
             
             if len(common_dates) < 10:
                 return None
             
-            stock_aligned = stock_returns.loc[common_dates]
-            market_aligned = nifty_returns.loc[common_dates]
+            stock_aligned = stock_returns[stock_dates.get_indexer(common_dates)]
+            market_aligned = nifty_returns[nifty_dates.get_indexer(common_dates)]
             
             # Calculate beta
             covariance = np.cov(stock_aligned, market_aligned)[0][1]
@@ -357,22 +352,25 @@ class RiskAgent:
             returns_data = {}
             
             for symbol in symbols:
-                historical = self._get_historical_data(symbol, "1mo")
-                if historical:
-                    df = pd.DataFrame(historical)
-                    df['date'] = pd.to_datetime(df['date'])
-                    df.set_index('date', inplace=True)
-                    returns = df['close'].pct_change().dropna()
-                    returns_data[symbol] = returns
+                returns = self.history.returns(symbol, "1mo")
+                if returns is not None:
+                    returns_data[symbol] = (self.history.return_dates(symbol, "1mo"), returns)
             
             if len(returns_data) < 2:
                 return None
             
-            # Create returns matrix
-            returns_df = pd.DataFrame(returns_data)
+            # Create returns matrix over the dates all symbols share
+            common_dates = None
+            for dates, _ in returns_data.values():
+                common_dates = dates if common_dates is None else common_dates.intersection(dates)
+            
+            returns_matrix = np.vstack([
+                returns[dates.get_indexer(common_dates)]
+                for dates, returns in returns_data.values()
+            ])
             
             # Calculate covariance matrix
-            cov_matrix = returns_df.cov()
+            cov_matrix = np.cov(returns_matrix)
             
             # Annualize
             cov_matrix = cov_matrix * 252
@@ -1,4 +1,7 @@
-from flask import Flask, render_template, request, jsonify
+from flask import Flask, render_template, request, jsonify, Response
+from flask_compress import Compress
+import orjson
+import asyncio
 import threading
 import time
 from datetime import datetime
@@ -8,6 +11,7 @@ from models.portfolio import init_db, get_all_recommendations, save_recommendati
 
 app = Flask(__name__)
 app.config.from_object(Config)
+Compress(app)
 
 # Initialize database
 init_db()
@@ -15,6 +19,14 @@ init_db()
 # Initialize orchestrator
 orchestrator = Orchestrator()
 
+def orjson_response(payload, status=200):
+    """Serialize a payload with orjson; ObjectIds and other unknown types fall back to str."""
+    return Response(
+        orjson.dumps(payload, default=str, option=orjson.OPT_SERIALIZE_NUMPY),
+        status=status,
+        mimetype='application/json'
+    )
+
 @app.route('/')
 def dashboard():
     """Main dashboard showing today's recommendations."""
@@ -40,7 +52,7 @@ def analyze():
         
         # Run analysis
         app.logger.info(f"Starting analysis for stocks: {stocks}")
-        results = orchestrator.analyze_portfolio(stocks)
+        results = asyncio.run(orchestrator.analyze_portfolio_async(stocks))
         
         # Save recommendations to database
         for result in results:
@@ -97,7 +109,7 @@ def analyze_deep():
                 metadata=recommendation.get('metadata', {})
             )
         
-        return jsonify({
+        return orjson_response({
             'status': 'success',
             'deep_analysis': deep_analysis,
             'recommendation': recommendation,
@@ -125,17 +137,18 @@ def history():
             offset=(page - 1) * per_page
         )
         
-        return jsonify({
+        # Recommendations are Mongo documents (dicts), not model objects
+        return orjson_response({
             'status': 'success',
             'recommendations': [
                 {
-                    'id': rec.id,
-                    'symbol': rec.symbol,
-                    'action': rec.action,
-                    'reasoning': rec.reasoning,
-                    'confidence': rec.confidence,
-                    'timestamp': rec.timestamp.isoformat(),
-                    'metadata': rec.metadata
+                    'id': rec.get('_id'),
+                    'symbol': rec.get('symbol'),
+                    'action': rec.get('action'),
+                    'reasoning': rec.get('reasoning'),
+                    'confidence': rec.get('confidence'),
+                    'timestamp': rec['timestamp'].isoformat() if rec.get('timestamp') else None,
+                    'metadata': rec.get('metadata', {})
                 }
                 for rec in recommendations
             ],
@@ -209,8 +222,31 @@ def not_found(error):
 def internal_error(error):
     return jsonify({'error': 'Internal server error'}), 500
 
+# Popen handles of the MCP servers started by start_mcp_servers, keyed by server file
+mcp_processes = {}
+
+def _watch_mcp_server(server_file, process):
+    """Reap an MCP server when it exits and log its exit code."""
+    exit_code = process.wait()
+    app.logger.warning(f"MCP server {server_file} exited with code {exit_code}")
+
+def stop_mcp_servers():
+    """Terminate the MCP servers started by this process, killing any that ignore it."""
+    import subprocess
+    
+    for process in mcp_processes.values():
+        if process.poll() is None:
+            process.terminate()
+    for process in mcp_processes.values():
+        try:
+            process.wait(timeout=5)
+        except subprocess.TimeoutExpired:
+            process.kill()
+
 def start_mcp_servers():
-    """Start MCP servers in background threads."""
+    """Start MCP servers as separate processes and wait until they accept connections."""
+    import atexit
+    import os
     import subprocess
     import sys
     
@@ -220,22 +256,44 @@ def start_mcp_servers():
         ('db_server.py', Config.MCP_DB_PORT)
     ]
     
+    started_ports = []
     for server_file, port in servers:
         try:
-            server_path = f"mcp_servers/{server_file}"
-            subprocess.Popen([sys.executable, server_path, str(port)], 
-                           cwd=app.root_path)
+            server_path = os.path.join(app.root_path, 'mcp_servers', server_file)
+            args = [sys.executable, server_path, str(port)]
+            # Run from the app root on every platform so the servers resolve relative paths alike
+            process = subprocess.Popen(args, cwd=app.root_path)
+            mcp_processes[server_file] = process
+            threading.Thread(target=_watch_mcp_server, args=(server_file, process),
+                             name=f"watch-{server_file}", daemon=True).start()
+            started_ports.append(port)
             app.logger.info(f"Started MCP server: {server_file} on port {port}")
         except Exception as e:
             app.logger.error(f"Failed to start {server_file}: {str(e)}")
+    
+    atexit.register(stop_mcp_servers)
+    
+    for port in started_ports:
+        if not wait_for_port(port):
+            app.logger.warning(f"MCP server on port {port} is not accepting connections yet")
+
+def wait_for_port(port: int, timeout: float = 10.0) -> bool:
+    """Poll until something is listening on localhost:port, or the timeout expires."""
+    import socket
+    
+    deadline = time.monotonic() + timeout
+    while time.monotonic() < deadline:
+        try:
+            with socket.create_connection(('localhost', port), timeout=0.1):
+                return True
+        except OSError:
+            time.sleep(0.05)
+    return False
 
 if __name__ == '__main__':
-    # Start MCP servers
+    # Start MCP servers (returns once they are accepting connections)
     start_mcp_servers()
     
-    # Give servers time to start
-    time.sleep(2)
-    
     # Start Flask app
     app.run(
         host='0.0.0.0',
@@ -3,16 +3,20 @@ from dotenv import load_dotenv
 
 load_dotenv()
 
+# Environment (with .env applied) captured once at import; Config values below are
+# plain class attributes resolved from this snapshot, not looked up per access
+_ENV = dict(os.environ)
+
 class Config:
     # AWS Bedrock Configuration
-    AWS_ACCESS_KEY_ID = os.getenv('AWS_ACCESS_KEY_ID')
-    AWS_SECRET_ACCESS_KEY = os.getenv('AWS_SECRET_ACCESS_KEY')
-    AWS_REGION = os.getenv('AWS_REGION', 'us-east-2')
-    MODEL_ID = os.getenv('MODEL_ID', 'arn:aws:bedrock:us-east-2:905418105552:inference-profile/us.anthropic.claude-3-5-sonnet-20240620-v1:0')
+    AWS_ACCESS_KEY_ID = _ENV.get('AWS_ACCESS_KEY_ID')
+    AWS_SECRET_ACCESS_KEY = _ENV.get('AWS_SECRET_ACCESS_KEY')
+    AWS_REGION = _ENV.get('AWS_REGION', 'us-east-2')
+    MODEL_ID = _ENV.get('MODEL_ID', 'arn:aws:bedrock:us-east-2:905418105552:inference-profile/us.anthropic.claude-3-5-sonnet-20240620-v1:0')
     
     # MongoDB Configuration
-    MONGODB_URL = os.getenv('MONGODB_URL', 'mongodb://localhost:27017')
-    MONGODB_NAME = os.getenv('MONGODB_NAME', 'stock_analyst')
+    MONGODB_URL = _ENV.get('MONGODB_URL', 'mongodb://localhost:27017')
+    MONGODB_NAME = _ENV.get('MONGODB_NAME', 'stock_analyst')
     MONGODB_COLLECTION_RECOMMENDATIONS = 'recommendations'
     MONGODB_COLLECTION_STOCK_DATA = 'stock_data'
     MONGODB_COLLECTION_NEWS_DATA = 'news_data'
@@ -21,18 +25,18 @@ class Config:
     MONGODB_COLLECTION_CORRELATION_MATRIX = 'correlation_matrix'
     
     # MCP Server Configuration
-    MCP_FINANCE_PORT = int(os.getenv('MCP_FINANCE_PORT', 8001))
-    MCP_RSS_PORT = int(os.getenv('MCP_RSS_PORT', 8002))
-    MCP_DB_PORT = int(os.getenv('MCP_DB_PORT', 8003))
+    MCP_FINANCE_PORT = int(_ENV.get('MCP_FINANCE_PORT', 8001))
+    MCP_RSS_PORT = int(_ENV.get('MCP_RSS_PORT', 8002))
+    MCP_DB_PORT = int(_ENV.get('MCP_DB_PORT', 8003))
     
     # API Configuration
-    NSE_API_URL = os.getenv('NSE_API_URL', 'https://www.nseindia.com')
-    BSE_API_URL = os.getenv('BSE_API_URL', 'https://api.bseindia.com')
-    TAVILY_API_KEY = os.getenv('TAVILY_API_KEY', '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')
+    NSE_API_URL = _ENV.get('NSE_API_URL', 'https://www.nseindia.com')
+    BSE_API_URL = _ENV.get('BSE_API_URL', 'https://api.bseindia.com')
+    TAVILY_API_KEY = _ENV.get('TAVILY_API_KEY', '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')
     
     # Application Configuration
-    SECRET_KEY = os.getenv('SECRET_KEY', 'your-secret-key-here')
-    DEBUG = os.getenv('DEBUG', 'False').lower() == 'true'
+    SECRET_KEY = _ENV.get('SECRET_KEY', 'your-secret-key-here')
+    DEBUG = _ENV.get('DEBUG', 'False').lower() == 'true'
     
     # Stock Configuration
     DEFAULT_STOCKS = ['INFY', 'TCS', 'RELIANCE', 'HDFCBANK', 'ICICIBANK']
@@ -3,53 +3,308 @@
 MCP Finance Server - Wraps NSE/BSE stock API for the stock analysis system.
 """
 
-import json
 import sys
+import contextvars
 import logging
-from typing import Dict, Any, Optional
-from datetime import datetime
+import orjson
+import math
+import queue
+import threading
+import time
+import re
+from collections import Counter
+from contextlib import contextmanager
+from concurrent.futures import ThreadPoolExecutor
+from types import MappingProxyType
+from typing import Dict, Any, Iterator, List, Optional, Tuple
+from datetime import datetime, timezone
+import numpy as np
 import yfinance as yf
 import requests
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
+
+_SQRT_252 = math.sqrt(252.0)
+
+# Random source for mock quotes
+_RNG = np.random.default_rng()
+
+# Timestamp shared by every dict in the response being built; set once per request by handle_request
+_REQUEST_TIMESTAMP = contextvars.ContextVar('request_timestamp', default=None)
+
+def _now_iso() -> str:
+    """The current request's ISO timestamp, or the current time outside a request."""
+    return _REQUEST_TIMESTAMP.get() or datetime.now().isoformat()
+
+def _map_in_context(executor: ThreadPoolExecutor, fn, *iterables) -> List[Any]:
+    """executor.map that runs each call in a copy of the caller's context, so the request timestamp carries over."""
+    futures = [executor.submit(contextvars.copy_context().run, fn, *args) for args in zip(*iterables)]
+    return [future.result() for future in futures]
+
+# Safe import: curl_cffi (installed with recent yfinance) reuses HTTP/2 connections with a browser TLS fingerprint
+try:
+    from curl_cffi import requests as curl_requests
+    CURL_CFFI_AVAILABLE = True
+except ImportError:
+    CURL_CFFI_AVAILABLE = False
+
+# Safe import: pyahocorasick scans text for every known name in one pass
+try:
+    import ahocorasick
+    AHOCORASICK_AVAILABLE = True
+except ImportError:
+    AHOCORASICK_AVAILABLE = False
+
+# Company names and tickers (lowercase) to NSE ticker symbols; read-only and shared by every server instance
+SYMBOL_MAP = MappingProxyType({
+    # Company names to ticker symbols
+    'suzlon energy': 'SUZLON',
+    'suzlon': 'SUZLON',
+    'reliance industries': 'RELIANCE',
+    'reliance': 'RELIANCE',
+    'tata consultancy services': 'TCS',
+    'tcs': 'TCS',
+    'infosys': 'INFY',
+    'infy': 'INFY',
+    'hdfc bank': 'HDFCBANK',
+    'hdfcbank': 'HDFCBANK',
+    'icici bank': 'ICICIBANK',
+    'icicibank': 'ICICIBANK',
+    'state bank of india': 'SBIN',
+    'sbin': 'SBIN',
+    'wipro': 'WIPRO',
+    'bharti airtel': 'BHARTIARTL',
+    'airtel': 'BHARTIARTL',
+    'itc': 'ITC',
+    'larsen toubro': 'LT',
+    'l&t': 'LT',
+    'mahindra': 'M&M',
+    'tata motors': 'TATAMOTORS',
+    'asian paints': 'ASIANPAINT',
+    'bajaj finance': 'BAJFINANCE',
+    'maruti suzuki': 'MARUTI',
+    'hindustan unilever': 'HINDUNILVR',
+    'kotak mahindra bank': 'KOTAKBANK',
+})
+
+# Lookup-key normalization: split camelCase, lowercase, collapse anything but letters, digits and '&'
+_CAMEL_RE = re.compile(r'(?<=[a-z])(?=[A-Z])')
+_NORMALIZE_RE = re.compile(r'[^a-z0-9&]+')
+
+def _normalize_key(text: str) -> str:
+    """Normalize a name or free text into SYMBOL_MAP key form, e.g. 'SuzlonEnergy' -> 'suzlon energy'."""
+    return _NORMALIZE_RE.sub(' ', _CAMEL_RE.sub(' ', text).lower()).strip()
+
+def _build_symbol_matcher():
+    """Compile SYMBOL_MAP keys into one multi-pattern matcher: an Aho-Corasick automaton, else a regex."""
+    if AHOCORASICK_AVAILABLE:
+        automaton = ahocorasick.Automaton()
+        for name, ticker in SYMBOL_MAP.items():
+            automaton.add_word(name, (name, ticker))
+        automaton.make_automaton()
+        return automaton
+    
+    # Longest names first so 'tata motors' wins over a shorter overlapping key
+    names = sorted(SYMBOL_MAP, key=len, reverse=True)
+    return re.compile(r'(?<!\w)(?:' + '|'.join(re.escape(name) for name in names) + r')(?!\w)')
+
+_SYMBOL_MATCHER = _build_symbol_matcher()
+
+# Major market indices as (display name, Yahoo symbol), and their symbols in one batch-quote list
+_INDICES = (
+    ('NIFTY 50', '^NSEI'),
+    ('NIFTY BANK', '^NSEBANK'),
+    ('SENSEX', '^BSESN'),
+)
+_INDEX_SYMBOLS = [symbol for _, symbol in _INDICES]
+
+# NSE constituents tracked per sector
+_SECTOR_STOCKS = MappingProxyType({
+    'IT': ('INFY', 'TCS', 'WIPRO', 'HCLTECH', 'TECHM'),
+    'BANKING': ('HDFCBANK', 'ICICIBANK', 'SBIN', 'KOTAKBANK', 'AXISBANK'),
+    'AUTO': ('MARUTI', 'TATAMOTORS', 'BAJAJ-AUTO', 'M&M'),
+    'PHARMA': ('SUNPHARMA', 'DRREDDY', 'CIPLA', 'LUPIN'),
+})
+
+class YahooClient:
+    """Thin client for Yahoo's chart and quote endpoints that skips yfinance's DataFrame layer."""
+    
+    CHART_URL = "https://query1.finance.yahoo.com/v8/finance/chart/{symbol}"
+    QUOTE_URL = "https://query1.finance.yahoo.com/v7/finance/quote"
+    CRUMB_URL = "https://query1.finance.yahoo.com/v1/test/getcrumb"
+    # Idle sessions kept for reuse; matches the fan-out of the index and sector fetches
+    SESSION_POOL_SIZE = 8
+    
+    def __init__(self, timeout: int = 10):
+        self.logger = logging.getLogger(__name__)
+        self.timeout = timeout
+        # Sessions outlive the per-request threads that borrow them, so their connections stay warm
+        self._sessions = queue.LifoQueue(maxsize=self.SESSION_POOL_SIZE)
+        
+        # Crumb and the cookies it is tied to, shared by every thread; refreshed only when Yahoo rejects it
+        self._crumb_lock = threading.Lock()
+        self._crumb: Optional[str] = None
+        self._crumb_cookies: Dict[str, str] = {}
+    
+    def _new_session(self):
+        """A fresh HTTP session, impersonating Chrome when curl_cffi is installed."""
+        if CURL_CFFI_AVAILABLE:
+            return curl_requests.Session(impersonate="chrome")
+        session = requests.Session()
+        session.headers.update({
+            'User-Agent': 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36'
+        })
+        return session
+    
+    @contextmanager
+    def _session(self):
+        """Borrow a session from the pool; curl_cffi sessions must not be used by two threads at once."""
+        try:
+            session = self._sessions.get_nowait()
+        except queue.Empty:
+            session = self._new_session()
+        try:
+            yield session
+        finally:
+            try:
+                self._sessions.put_nowait(session)
+            except queue.Full:
+                session.close()
+    
+    def daily_bars(self, symbol: str, period: str = "1mo") -> Optional[Dict[str, Any]]:
+        """Daily OHLCV bars as {'meta', 'dates', 'open', 'high', 'low', 'close', 'volume'}, or None."""
+        try:
+            with self._session() as session:
+                response = session.get(
+                    self.CHART_URL.format(symbol=symbol),
+                    params={'range': period, 'interval': '1d'},
+                    timeout=self.timeout
+                )
+            if response.status_code != 200:
+                return None
+            
+            results = (response.json().get('chart') or {}).get('result')
+            if not results:
+                return None
+            
+            result = results[0]
+            timestamps = result.get('timestamp')
+            quote = (result.get('indicators', {}).get('quote') or [{}])[0]
+            if not timestamps or not quote.get('close'):
+                return None
+            
+            # Missing values arrive as null and become NaN; drop bars without a close, as yfinance does
+            columns = {
+                name: np.array(quote.get(name) or [None] * len(timestamps), dtype=np.float64)
+                for name in ('open', 'high', 'low', 'close', 'volume')
+            }
+            valid = ~np.isnan(columns['close'])
+            if not valid.any():
+                return None
+            
+            # Bar dates are in exchange-local time
+            meta = result.get('meta', {})
+            offset = meta.get('gmtoffset', 0)
+            dates = [
+                datetime.fromtimestamp(ts + offset, timezone.utc).date()
+                for ts, keep in zip(timestamps, valid) if keep
+            ]
+            
+            bars = {name: values[valid] for name, values in columns.items()}
+            bars['volume'] = np.nan_to_num(bars['volume']).astype(np.int64)
+            bars['dates'] = dates
+            bars['meta'] = meta
+            return bars
+        
+        except Exception as e:
+            self.logger.warning(f"Yahoo chart request failed for {symbol}: {str(e)}")
+            return None
+    
+    def _get_crumb(self, stale: Optional[str] = None) -> Tuple[Optional[str], Dict[str, str]]:
+        """Crumb the quote endpoint requires, with its cookies; fetched once, or again when stale is the current crumb."""
+        with self._crumb_lock:
+            if self._crumb is None or self._crumb == stale:
+                self._crumb = None
+                with self._session() as session:
+                    session.get("https://fc.yahoo.com", timeout=self.timeout)
+                    response = session.get(self.CRUMB_URL, timeout=self.timeout)
+                    if response.status_code == 200 and response.text:
+                        self._crumb = response.text
+                        self._crumb_cookies = session.cookies.get_dict()
+            return self._crumb, self._crumb_cookies
+    
+    def _quote_request(self, symbols: List[str], crumb: Optional[str], cookies: Dict[str, str]):
+        """One GET against the quote endpoint with the given crumb and cookies."""
+        params = {'symbols': ','.join(symbols)}
+        if crumb:
+            params['crumb'] = crumb
+        with self._session() as session:
+            return session.get(self.QUOTE_URL, params=params, cookies=cookies, timeout=self.timeout)
+    
+    def quotes(self, symbols: List[str]) -> Dict[str, Dict[str, Any]]:
+        """Latest quotes for several symbols in a single request, keyed by symbol; empty on failure."""
+        try:
+            crumb, cookies = self._get_crumb()
+            response = self._quote_request(symbols, crumb, cookies)
+            if response.status_code in (401, 403):
+                # The crumb expired or was revoked; fetch a new one and retry once
+                crumb, cookies = self._get_crumb(stale=crumb)
+                response = self._quote_request(symbols, crumb, cookies)
+            if response.status_code != 200:
+                return {}
+            
+            results = (response.json().get('quoteResponse') or {}).get('result') or []
+            return {quote['symbol']: quote for quote in results if 'symbol' in quote}
+        
+        except Exception as e:
+            self.logger.warning(f"Yahoo quote request failed for {symbols}: {str(e)}")
+            return {}
 
 class MCPFinanceServer:
     """MCP server for financial data operations."""
     
+    # Seconds that quote-summary info and daily bars are reused before Yahoo is asked again
+    INFO_CACHE_TTL = 60
+    BARS_CACHE_TTL = 60
+    # NSE quotes are live, so they are only reused briefly
+    NSE_CACHE_TTL = 15
+    
     def __init__(self):
         self.logger = logging.getLogger(__name__)
         self.session = requests.Session()
+        self.yahoo = YahooClient()
         
-        # Symbol mapping for common company names to ticker symbols
-        self.symbol_map = {
-            # Company names to ticker symbols
-            'suzlon energy': 'SUZLON',
-            'suzlon': 'SUZLON',
-            'reliance industries': 'RELIANCE',
-            'reliance': 'RELIANCE',
-            'tata consultancy services': 'TCS',
-            'tcs': 'TCS',
-            'infosys': 'INFY',
-            'infy': 'INFY',
-            'hdfc bank': 'HDFCBANK',
-            'hdfcbank': 'HDFCBANK',
-            'icici bank': 'ICICIBANK',
-            'icicibank': 'ICICIBANK',
-            'state bank of india': 'SBIN',
-            'sbin': 'SBIN',
-            'wipro': 'WIPRO',
-            'bharti airtel': 'BHARTIARTL',
-            'airtel': 'BHARTIARTL',
-            'itc': 'ITC',
-            'larsen toubro': 'LT',
-            'l&t': 'LT',
-            'mahindra': 'M&M',
-            'tata motors': 'TATAMOTORS',
-            'asian paints': 'ASIANPAINT',
-            'bajaj finance': 'BAJFINANCE',
-            'maruti suzuki': 'MARUTI',
-            'hindustan unilever': 'HINDUNILVR',
-            'kotak mahindra bank': 'KOTAKBANK',
+        # yf_symbol -> (stored_at, info) and (yf_symbol, period) -> (stored_at, bars); shared by fetch threads
+        self._cache_lock = threading.Lock()
+        self._info_cache: Dict[str, Tuple[float, Dict[str, Any]]] = {}
+        self._bars_cache: Dict[Tuple[str, str], Tuple[float, Dict[str, Any]]] = {}
+        self._nse_cache: Dict[str, Tuple[float, Dict[str, Any]]] = {}
+        self._nse_primed = False
+        
+        # JSON-RPC method name -> handler taking the params dict
+        self._dispatch = {
+            'get_stock_data': lambda params: self.get_stock_data(params.get('symbol')),
+            'get_market_indices': lambda params: self.get_market_indices(),
+            'get_sector_data': lambda params: self.get_sector_data(params.get('sector')),
+            'recognize_tickers': self._recognize_tickers_result,
+            'get_historical_data': lambda params: self.get_historical_data(
+                params.get('symbol'),
+                params.get('period', '1mo')
+            ),
         }
         
+        # Pool keep-alive connections (so repeat NSE calls skip the TLS handshake) and retry transient errors
+        adapter = HTTPAdapter(
+            pool_connections=32,
+            pool_maxsize=64,
+            max_retries=Retry(total=2, backoff_factor=0.2, status_forcelist=[429, 500, 502, 503, 504])
+        )
+        self.session.mount('https://', adapter)
+        self.session.mount('http://', adapter)
+        
+        # Symbol mapping for common company names to ticker symbols
+        self.symbol_map = SYMBOL_MAP
+        
         # Advanced symbol search alternatives
         self.symbol_alternatives = {
             'SUZLON': ['SUZLON.NS', 'SUZLON.BO', '532667.BO'],  # BSE code for Suzlon
@@ -65,27 +320,20 @@ class MCPFinanceServer:
             'User-Agent': 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36',
             'Accept': 'application/json',
             'Accept-Language': 'en-US,en;q=0.9',
+            'Connection': 'keep-alive',
         }
+        self.session.headers.update(self.nse_headers)
     
     def handle_request(self, request: Dict[str, Any]) -> Dict[str, Any]:
         """Handle JSON-RPC request."""
+        timestamp_token = _REQUEST_TIMESTAMP.set(datetime.now().isoformat())
         try:
             method = request.get('method')
             params = request.get('params', {})
             request_id = request.get('id')
             
-            if method == 'get_stock_data':
-                result = self.get_stock_data(params.get('symbol'))
-            elif method == 'get_market_indices':
-                result = self.get_market_indices()
-            elif method == 'get_sector_data':
-                result = self.get_sector_data(params.get('sector'))
-            elif method == 'get_historical_data':
-                result = self.get_historical_data(
-                    params.get('symbol'),
-                    params.get('period', '1mo')
-                )
-            else:
+            handler = self._dispatch.get(method)
+            if handler is None:
                 return {
                     'jsonrpc': '2.0',
                     'id': request_id,
@@ -98,7 +346,7 @@ class MCPFinanceServer:
             return {
                 'jsonrpc': '2.0',
                 'id': request_id,
-                'result': result
+                'result': handler(params)
             }
             
         except Exception as e:
@@ -111,6 +359,8 @@ class MCPFinanceServer:
                     'message': f'Internal error: {str(e)}'
                 }
             }
+        finally:
+            _REQUEST_TIMESTAMP.reset(timestamp_token)
     
     def get_stock_data(self, symbol: str) -> Optional[Dict[str, Any]]:
         """Get comprehensive stock data for a symbol."""
@@ -138,15 +388,38 @@ class MCPFinanceServer:
     
     def _normalize_symbol(self, symbol: str) -> str:
         """Normalize symbol using the symbol map."""
-        # Convert to lowercase for lookup
-        symbol_lower = symbol.lower().strip()
+        symbol = symbol.strip()
+        
+        # Normalized lookup; if not found, return the original symbol (in uppercase)
+        return SYMBOL_MAP.get(_normalize_key(symbol), symbol.upper())
+    
+    def recognize_tickers(self, text: str) -> Counter:
+        """Count mentions of every known company name or ticker in free text, in a single scan."""
+        # Normalized text also matches names split by punctuation or extra spaces, e.g. 'Tata-Motors'
+        text_lower = _normalize_key(text)
+        hits = Counter()
         
-        # Check if it's in our mapping
-        if symbol_lower in self.symbol_map:
-            return self.symbol_map[symbol_lower]
+        if AHOCORASICK_AVAILABLE:
+            # iter_long yields the longest non-overlapping matches, so 'reliance industries' is not also 'reliance'
+            for end, (name, ticker) in _SYMBOL_MATCHER.iter_long(text_lower):
+                start = end - len(name) + 1
+                # Only count whole words, so 'itc' does not match inside 'switch'
+                if (start == 0 or not text_lower[start - 1].isalnum()) and \
+                        (end + 1 == len(text_lower) or not text_lower[end + 1].isalnum()):
+                    hits[ticker] += 1
+        else:
+            for match in _SYMBOL_MATCHER.finditer(text_lower):
+                hits[SYMBOL_MAP[match.group(0)]] += 1
         
-        # If not found, return the original symbol (in uppercase)
-        return symbol.upper().strip()
+        return hits
+    
+    def _recognize_tickers_result(self, params: Dict[str, Any]) -> Dict[str, Any]:
+        """recognize_tickers counts plus the most frequently mentioned ticker."""
+        hits = self.recognize_tickers(params.get('text', ''))
+        return {
+            'tickers': dict(hits),
+            'primary': hits.most_common(1)[0][0] if hits else None
+        }
     
     def _get_yfinance_data(self, symbol: str) -> Optional[Dict[str, Any]]:
         """Get data using yfinance with advanced symbol search."""
@@ -167,25 +440,29 @@ class MCPFinanceServer:
             for yf_symbol in symbols_to_try:
                 try:
                     self.logger.info(f"Trying symbol: {yf_symbol}")
-                    ticker = yf.Ticker(yf_symbol)
-                    
                     # Get basic info first
-                    info = ticker.info
+                    info = self._get_ticker_info(yf_symbol)
                     if not info or info.get('regularMarketPrice') is None:
                         self.logger.warning(f"No market price data for {yf_symbol}")
                         continue
                     
                     # Get historical data
-                    hist = ticker.history(period="1mo")  # Try 1 month instead of 5 days
+                    bars = self._get_daily_bars(yf_symbol, "1mo")  # Try 1 month instead of 5 days
                     
-                    if not hist.empty:
+                    if bars:
                         self.logger.info(f"Successfully fetched data for {yf_symbol}")
                         
                         # Calculate additional metrics
-                        current_price = hist['Close'].iloc[-1] if not hist.empty else info.get('regularMarketPrice', 0)
-                        price_change = hist['Close'].iloc[-1] - hist['Close'].iloc[-2] if len(hist) > 1 else 0
-                        price_change_percent = (price_change / hist['Close'].iloc[-2] * 100) if len(hist) > 1 and hist['Close'].iloc[-2] != 0 else 0
-                        volatility = hist['Close'].pct_change().std() * (252 ** 0.5) if len(hist) > 5 else 0.2  # Annualized volatility
+                        closes = bars['close']
+                        current_price = closes[-1]
+                        price_change = closes[-1] - closes[-2] if len(closes) > 1 else 0
+                        price_change_percent = (price_change / closes[-2] * 100) if len(closes) > 1 and closes[-2] != 0 else 0
+                        if len(closes) > 5:
+                            # One np.diff over the contiguous close buffer; nanstd skips gaps like pct_change().std() did
+                            returns = np.diff(closes) / closes[:-1]
+                            volatility = np.nanstd(returns, ddof=1) * _SQRT_252  # Annualized volatility
+                        else:
+                            volatility = 0.2
                         
                         return {
                             'symbol': symbol,
@@ -193,15 +470,15 @@ class MCPFinanceServer:
                             'current_price': float(current_price),
                             'price_change': float(price_change),
                             'price_change_percent': float(price_change_percent),
-                            'volume': int(hist['Volume'].iloc[-1]) if not hist.empty and 'Volume' in hist.columns else 0,
+                            'volume': int(bars['volume'][-1]),
                             'market_cap': info.get('marketCap', 0),
                             'volatility': float(volatility),
                             'company_name': info.get('shortName', symbol),
                             'sector': info.get('sector', 'Unknown'),
                             'industry': info.get('industry', 'Unknown'),
-                            'last_updated': datetime.now().isoformat(),
+                            'last_updated': _now_iso(),
                             'source': 'yfinance',
-                            'data_quality': 'real' if not hist.empty else 'info_only'
+                            'data_quality': 'real'
                         }
                     
                 except Exception as e:
@@ -217,12 +494,74 @@ class MCPFinanceServer:
             self.logger.error(f"Error in _get_yfinance_data for {symbol}: {str(e)}")
             return self._generate_mock_data(symbol, f"Data fetch error: {str(e)}")
     
+    def _cache_get(self, cache: Dict, key: Any, ttl: float) -> Optional[Dict[str, Any]]:
+        """Return a cached value if it is younger than ttl seconds."""
+        with self._cache_lock:
+            entry = cache.get(key)
+            if entry is None:
+                return None
+            
+            stored_at, value = entry
+            if time.monotonic() - stored_at > ttl:
+                cache.pop(key, None)
+                return None
+            
+            return value
+    
+    def _cache_put(self, cache: Dict, key: Any, value: Dict[str, Any]):
+        """Store a value in an in-process cache."""
+        with self._cache_lock:
+            cache[key] = (time.monotonic(), value)
+    
+    def _get_ticker_info(self, yf_symbol: str) -> Optional[Dict[str, Any]]:
+        """yfinance quote-summary info for a symbol, cached for INFO_CACHE_TTL seconds."""
+        info = self._cache_get(self._info_cache, yf_symbol, self.INFO_CACHE_TTL)
+        if info is None:
+            info = yf.Ticker(yf_symbol).info
+            if info:
+                self._cache_put(self._info_cache, yf_symbol, info)
+        return info
+    
+    def _get_daily_bars(self, yf_symbol: str, period: str) -> Optional[Dict[str, Any]]:
+        """Daily bars, cached for BARS_CACHE_TTL seconds so quote and history calls share one fetch."""
+        key = (yf_symbol, period)
+        bars = self._cache_get(self._bars_cache, key, self.BARS_CACHE_TTL)
+        if bars is None:
+            bars = self._fetch_daily_bars(yf_symbol, period)
+            if bars:
+                self._cache_put(self._bars_cache, key, bars)
+        return bars
+    
+    def _fetch_daily_bars(self, yf_symbol: str, period: str) -> Optional[Dict[str, Any]]:
+        """Daily bars from the direct chart client, falling back to yfinance history."""
+        bars = self.yahoo.daily_bars(yf_symbol, period)
+        if bars:
+            return bars
+        
+        try:
+            hist = yf.Ticker(yf_symbol).history(period=period)
+            if hist.empty:
+                return None
+            
+            return {
+                'meta': {},
+                'dates': hist.index.date.tolist(),
+                'open': hist['Open'].to_numpy(dtype=np.float64),
+                'high': hist['High'].to_numpy(dtype=np.float64),
+                'low': hist['Low'].to_numpy(dtype=np.float64),
+                'close': hist['Close'].to_numpy(dtype=np.float64),
+                'volume': np.nan_to_num(hist['Volume'].to_numpy(dtype=np.float64)).astype(np.int64)
+            }
+        
+        except Exception as e:
+            self.logger.warning(f"yfinance history failed for {yf_symbol}: {str(e)}")
+            return None
+    
     def _generate_mock_data(self, symbol: str, reason: str) -> Dict[str, Any]:
         """Generate mock data when real data is not available."""
-        import random
-        
-        base_price = random.uniform(10, 500)
-        price_change = random.uniform(-5, 5)
+        # Draw all random fields in two vectorized calls
+        base_price, price_change, volatility = _RNG.uniform([10, -5, 0.15], [500, 5, 0.45]).tolist()
+        volume, market_cap = _RNG.integers([10000, 1000000000], [1000000, 100000000000], endpoint=True).tolist()
         
         return {
             'symbol': symbol,
@@ -230,23 +569,43 @@ class MCPFinanceServer:
             'current_price': round(base_price, 2),
             'price_change': round(price_change, 2),
             'price_change_percent': round(price_change / base_price * 100, 2),
-            'volume': random.randint(10000, 1000000),
-            'market_cap': random.randint(1000000000, 100000000000),
-            'volatility': round(random.uniform(0.15, 0.45), 3),
+            'volume': volume,
+            'market_cap': market_cap,
+            'volatility': round(volatility, 3),
             'company_name': symbol.title(),
             'sector': 'Energy' if 'suzlon' in symbol.lower() else 'Technology',
             'industry': 'Renewable Energy' if 'suzlon' in symbol.lower() else 'Software',
-            'last_updated': datetime.now().isoformat(),
+            'last_updated': _now_iso(),
             'source': 'mock',
             'data_quality': 'mock',
             'warning': reason
         }
 
+    def _prime_nse_cookies(self):
+        """Visit the NSE homepage so the session holds the cookies the quote API checks for."""
+        try:
+            self.session.get('https://www.nseindia.com', timeout=5)
+            self._nse_primed = True
+        except Exception as e:
+            self.logger.warning(f"Failed to prime NSE cookies: {str(e)}")
+    
     def _get_nse_data(self, symbol: str) -> Optional[Dict[str, Any]]:
-        """Get data from NSE API."""
+        """Get data from NSE API, reusing a quote for NSE_CACHE_TTL seconds."""
+        cached = self._cache_get(self._nse_cache, symbol, self.NSE_CACHE_TTL)
+        if cached is not None:
+            return cached
+        
         try:
+            if not self._nse_primed:
+                self._prime_nse_cookies()
+            
             url = f"https://www.nseindia.com/api/quote-equity?symbol={symbol}"
-            response = self.session.get(url, headers=self.nse_headers, timeout=10)
+            response = self.session.get(url, timeout=10)
+            
+            if response.status_code in (401, 403):
+                # Cookies expired; prime again and retry once
+                self._prime_nse_cookies()
+                response = self.session.get(url, timeout=10)
             
             if response.status_code == 200:
                 data = response.json()
@@ -254,7 +613,7 @@ class MCPFinanceServer:
                 if 'priceInfo' in data:
                     price_info = data['priceInfo']
                     
-                    return {
+                    nse_data = {
                         "symbol": symbol,
                         "price": float(price_info.get('lastPrice', 0)),
                         "open": float(price_info.get('open', 0)),
@@ -264,9 +623,11 @@ class MCPFinanceServer:
                         "change_percent": float(price_info.get('pChange', 0)),
                         "volume": int(data.get('securityInfo', {}).get('totalTradedVolume', 0)),
                         "source": "nse",
-                        "timestamp": datetime.now().isoformat(),
+                        "timestamp": _now_iso(),
                         "currency": "INR"
                     }
+                    self._cache_put(self._nse_cache, symbol, nse_data)
+                    return nse_data
             
             return None
             
@@ -277,108 +638,134 @@ class MCPFinanceServer:
     def get_market_indices(self) -> Dict[str, Any]:
         """Get major market indices."""
         try:
-            indices = {
-                'NIFTY 50': '^NSEI',
-                'NIFTY BANK': '^NSEBANK',
-                'SENSEX': '^BSESN'
+            # One batched quote request for all indices
+            quotes = self.yahoo.quotes(_INDEX_SYMBOLS)
+            indices_data = {
+                name: self._index_from_quote(name, symbol, quotes[symbol])
+                for name, symbol in _INDICES
+                if quotes.get(symbol, {}).get('regularMarketPrice') is not None
             }
             
-            indices_data = {}
-            
-            for name, symbol in indices.items():
-                try:
-                    ticker = yf.Ticker(symbol)
-                    hist = ticker.history(period="2d")
-                    
-                    if not hist.empty:
-                        latest = hist.iloc[-1]
-                        previous = hist.iloc[-2] if len(hist) > 1 else latest
-                        
-                        indices_data[name] = {
-                            "symbol": symbol,
-                            "name": name,
-                            "price": float(latest['Close']),
-                            "open": float(latest['Open']),
-                            "high": float(latest['High']),
-                            "low": float(latest['Low']),
-                            "volume": int(latest['Volume']),
-                            "change": float(latest['Close'] - previous['Close']),
-                            "change_percent": float((latest['Close'] - previous['Close']) / previous['Close'] * 100),
-                            "timestamp": datetime.now().isoformat()
-                        }
-                except Exception as e:
-                    self.logger.warning(f"Failed to get data for {name}: {str(e)}")
-                    continue
+            # Fetch any index the quote call missed concurrently from daily bars
+            missing = [(name, symbol) for name, symbol in _INDICES if name not in indices_data]
+            if missing:
+                with ThreadPoolExecutor(max_workers=len(missing)) as executor:
+                    results = _map_in_context(executor, lambda item: self._get_index_data(*item), missing)
+                for (name, _), data in zip(missing, results):
+                    if data:
+                        indices_data[name] = data
             
-            return indices_data
+            return {name: indices_data[name] for name, _ in _INDICES if name in indices_data}
             
         except Exception as e:
             self.logger.error(f"Error getting market indices: {str(e)}")
             return {}
     
+    def _index_from_quote(self, name: str, symbol: str, quote: Dict[str, Any]) -> Dict[str, Any]:
+        """Build an index summary from a Yahoo quote result."""
+        return {
+            "symbol": symbol,
+            "name": name,
+            "price": float(quote['regularMarketPrice']),
+            "open": float(quote.get('regularMarketOpen') or 0),
+            "high": float(quote.get('regularMarketDayHigh') or 0),
+            "low": float(quote.get('regularMarketDayLow') or 0),
+            "volume": int(quote.get('regularMarketVolume') or 0),
+            "change": float(quote.get('regularMarketChange') or 0),
+            "change_percent": float(quote.get('regularMarketChangePercent') or 0),
+            "timestamp": _now_iso()
+        }
+    
+    def _get_index_data(self, name: str, symbol: str) -> Optional[Dict[str, Any]]:
+        """Get the latest two-day summary for one market index."""
+        try:
+            bars = self._get_daily_bars(symbol, "2d")
+            
+            if bars:
+                close = bars['close'][-1]
+                previous_close = bars['close'][-2] if len(bars['close']) > 1 else close
+                
+                return {
+                    "symbol": symbol,
+                    "name": name,
+                    "price": float(close),
+                    "open": float(bars['open'][-1]),
+                    "high": float(bars['high'][-1]),
+                    "low": float(bars['low'][-1]),
+                    "volume": int(bars['volume'][-1]),
+                    "change": float(close - previous_close),
+                    "change_percent": float((close - previous_close) / previous_close * 100),
+                    "timestamp": _now_iso()
+                }
+            
+            return None
+            
+        except Exception as e:
+            self.logger.warning(f"Failed to get data for {name}: {str(e)}")
+            return None
+    
     def get_sector_data(self, sector: str) -> Dict[str, Any]:
         """Get sector-wise stock data."""
         try:
-            sector_stocks = {
-                'IT': ['INFY.NS', 'TCS.NS', 'WIPRO.NS', 'HCLTECH.NS', 'TECHM.NS'],
-                'BANKING': ['HDFCBANK.NS', 'ICICIBANK.NS', 'SBIN.NS', 'KOTAKBANK.NS', 'AXISBANK.NS'],
-                'AUTO': ['MARUTI.NS', 'TATAMOTORS.NS', 'BAJAJ-AUTO.NS', 'M&M.NS'],
-                'PHARMA': ['SUNPHARMA.NS', 'DRREDDY.NS', 'CIPLA.NS', 'LUPIN.NS']
-            }
-            
-            stocks = sector_stocks.get(sector.upper(), [])
+            clean_symbols = _SECTOR_STOCKS.get(sector.upper(), ())
             sector_data = {}
             
-            for stock_symbol in stocks:
-                try:
-                    clean_symbol = stock_symbol.replace('.NS', '')
-                    data = self.get_stock_data(clean_symbol)
+            # Fetch every stock in the sector concurrently instead of one after another
+            if clean_symbols:
+                with ThreadPoolExecutor(max_workers=len(clean_symbols)) as executor:
+                    results = _map_in_context(executor, self._get_sector_stock, clean_symbols)
+                
+                for clean_symbol, data in zip(clean_symbols, results):
                     if data:
                         sector_data[clean_symbol] = data
-                except Exception as e:
-                    self.logger.warning(f"Failed to get data for {stock_symbol}: {str(e)}")
-                    continue
             
             return {
                 'sector': sector,
                 'stocks': sector_data,
-                'timestamp': datetime.now().isoformat()
+                'timestamp': _now_iso()
             }
             
         except Exception as e:
             self.logger.error(f"Error getting sector data for {sector}: {str(e)}")
             return {}
     
+    def _get_sector_stock(self, symbol: str) -> Optional[Dict[str, Any]]:
+        """get_stock_data for one sector member, logging instead of raising."""
+        try:
+            return self.get_stock_data(symbol)
+        except Exception as e:
+            self.logger.warning(f"Failed to get data for {symbol}: {str(e)}")
+            return None
+    
     def get_historical_data(self, symbol: str, period: str = "1mo") -> Optional[Dict[str, Any]]:
-        """Get historical stock data."""
+        """Get historical stock data; 'data' is a lazy row iterator the HTTP handler streams out."""
         try:
-            yf_symbol = f"{symbol}.NS"
-            ticker = yf.Ticker(yf_symbol)
-            hist = ticker.history(period=period)
+            bars = self._get_daily_bars(f"{symbol}.NS", period)
             
-            if hist.empty:
+            if not bars:
                 # Try BSE
-                yf_symbol = f"{symbol}.BO"
-                ticker = yf.Ticker(yf_symbol)
-                hist = ticker.history(period=period)
+                bars = self._get_daily_bars(f"{symbol}.BO", period)
             
-            if not hist.empty:
+            if bars:
                 return {
                     "symbol": symbol,
                     "period": period,
-                    "data": [
+                    "data": (
                         {
-                            "date": str(date.date()),
-                            "open": float(row['Open']),
-                            "high": float(row['High']),
-                            "low": float(row['Low']),
-                            "close": float(row['Close']),
-                            "volume": int(row['Volume'])
+                            "date": str(date),
+                            "open": o,
+                            "high": h,
+                            "low": l,
+                            "close": c,
+                            "volume": v
                         }
-                        for date, row in hist.iterrows()
-                    ],
+                        for date, o, h, l, c, v in zip(
+                            bars['dates'], bars['open'].tolist(), bars['high'].tolist(),
+                            bars['low'].tolist(), bars['close'].tolist(), bars['volume'].tolist()
+                        )
+                    ),
                     "source": "yfinance",
-                    "timestamp": datetime.now().isoformat()
+                    "timestamp": _now_iso()
                 }
             
             return None
@@ -387,6 +774,29 @@ class MCPFinanceServer:
             self.logger.error(f"Error getting historical data for {symbol}: {str(e)}")
             return None
 
+def _dumps(payload: Any) -> bytes:
+    """Serialize a response with orjson; numpy values and non-string keys are handled natively."""
+    return orjson.dumps(payload, default=str, option=orjson.OPT_SERIALIZE_NUMPY | orjson.OPT_NON_STR_KEYS)
+
+def _iter_response_chunks(response: Dict[str, Any], chunk_size: int = 65536) -> Iterator[bytes]:
+    """Serialize a response whose result 'data' is a row iterator, row by row in chunk_size pieces."""
+    result = response['result']
+    rows = result['data']
+    
+    # Serialize the envelope around an empty list, then splice the rows in between
+    prefix, suffix = _dumps(dict(response, result=dict(result, data=[]))).split(b'"data":[]', 1)
+    buffer = bytearray(prefix + b'"data":[')
+    for i, row in enumerate(rows):
+        if i:
+            buffer += b','
+        buffer += _dumps(row)
+        if len(buffer) >= chunk_size:
+            yield bytes(buffer)
+            buffer.clear()
+    
+    buffer += b']' + suffix
+    yield bytes(buffer)
+
 def run_server(port: int = 8001):
     """Run the MCP Finance server."""
     server = MCPFinanceServer()
@@ -394,24 +804,49 @@ def run_server(port: int = 8001):
     print(f"MCP Finance Server starting on port {port}")
     
     try:
-        from http.server import HTTPServer, BaseHTTPRequestHandler
-        import json
+        from http.server import ThreadingHTTPServer, BaseHTTPRequestHandler
         
         class MCPHandler(BaseHTTPRequestHandler):
             def do_POST(self):
                 try:
                     content_length = int(self.headers['Content-Length'])
                     post_data = self.rfile.read(content_length)
-                    request = json.loads(post_data.decode('utf-8'))
+                    request = orjson.loads(post_data)
                     
                     response = server.handle_request(request)
                     
+                    result = response.get('result')
+                    if isinstance(result, dict) and isinstance(result.get('data'), Iterator):
+                        # Stream long histories as they are serialized; the body ends when the
+                        # connection closes, so no Content-Length is sent
+                        chunks = _iter_response_chunks(response)
+                        first_chunk = next(chunks)
+                        
+                        self.send_response(200)
+                        self.send_header('Content-type', 'application/json')
+                        self.send_header('Access-Control-Allow-Origin', '*')
+                        self.end_headers()
+                        
+                        # Headers are out, so a failure here must not fall through to the 500
+                        # response below; cut the connection and let the client see a short body
+                        try:
+                            self.wfile.write(first_chunk)
+                            for chunk in chunks:
+                                self.wfile.write(chunk)
+                        except Exception as e:
+                            server.logger.error(f"Error streaming response: {e}")
+                            self.close_connection = True
+                        return
+                    
+                    response_data = _dumps(response)
+                    
                     self.send_response(200)
                     self.send_header('Content-type', 'application/json')
+                    self.send_header('Content-Length', str(len(response_data)))
                     self.send_header('Access-Control-Allow-Origin', '*')
                     self.end_headers()
                     
-                    self.wfile.write(json.dumps(response).encode('utf-8'))
+                    self.wfile.write(response_data)
                     
                 except Exception as e:
                     self.send_response(500)
@@ -427,7 +862,7 @@ def run_server(port: int = 8001):
                         }
                     }
                     
-                    self.wfile.write(json.dumps(error_response).encode('utf-8'))
+                    self.wfile.write(_dumps(error_response))
             
             def do_OPTIONS(self):
                 self.send_response(200)
@@ -436,7 +871,8 @@ def run_server(port: int = 8001):
                 self.send_header('Access-Control-Allow-Headers', 'Content-Type')
                 self.end_headers()
         
-        httpd = HTTPServer(('localhost', port), MCPHandler)
+        # One thread per request, so concurrent clients no longer queue behind slow Yahoo/NSE calls
+        httpd = ThreadingHTTPServer(('localhost', port), MCPHandler)
         print(f"MCP Finance Server running on http://localhost:{port}")
         httpd.serve_forever()
         
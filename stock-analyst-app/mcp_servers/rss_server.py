@@ -3,42 +3,160 @@
 MCP RSS Server - Wraps financial news RSS feeds for the stock analysis system.
 """
 
-import json
 import sys
 import logging
+import orjson
 import re
-from typing import Dict, Any, Optional, List
+import threading
+import time
+from collections import Counter, OrderedDict
+from itertools import islice
+from concurrent.futures import ThreadPoolExecutor, as_completed, TimeoutError as FuturesTimeoutError
+from typing import Dict, Any, Optional, List, Tuple
 from datetime import datetime
+from types import MappingProxyType
+from urllib.parse import urlsplit
 import feedparser
 import requests
+from requests.adapters import HTTPAdapter
 from bs4 import BeautifulSoup
 
+# Safe import: pyahocorasick finds symbols and sentiment keywords in one pass
+try:
+    import ahocorasick
+    AHOCORASICK_AVAILABLE = True
+except ImportError:
+    AHOCORASICK_AVAILABLE = False
+
+# Safe import: lxml strips HTML in C, far faster than BeautifulSoup's html.parser
+try:
+    import lxml.html
+    LXML_AVAILABLE = True
+except ImportError:
+    LXML_AVAILABLE = False
+
+# Shared across requests so each call doesn't spin up fresh threads
+_EXECUTOR = ThreadPoolExecutor(max_workers=8)
+FEED_TIMEOUT = 10
+
+# RSS feeds and the source name shown for each, resolved once rather than per entry.
+# These tables and everything compiled from them below are built once at import and
+# shared (read-only) by every server instance, thread and forked worker.
+FEED_SOURCES = MappingProxyType({
+    'https://economictimes.indiatimes.com/markets/rssfeeds/1977021501.cms': 'Economic Times',
+    'https://www.moneycontrol.com/rss/business.xml': 'MoneyControl',
+    'https://feeds.feedburner.com/ndtvprofit-latest': 'NDTV Profit',
+    'https://www.business-standard.com/rss/markets-106.rss': 'Business Standard',
+    'https://www.livemint.com/rss/markets': 'LiveMint'
+})
+RSS_FEEDS = tuple(FEED_SOURCES)
+
+# Sentiment keywords
+POSITIVE_KEYWORDS = (
+    'profit', 'growth', 'gain', 'rise', 'surge', 'bullish', 'positive',
+    'upgrade', 'beat', 'strong', 'excellent', 'good', 'buy', 'outperform'
+)
+
+NEGATIVE_KEYWORDS = (
+    'loss', 'decline', 'fall', 'drop', 'bearish', 'negative', 'weak',
+    'downgrade', 'miss', 'poor', 'bad', 'sell', 'underperform', 'crash'
+)
+
+# Stock and index symbols recognised in news text
+KNOWN_SYMBOLS = frozenset({
+    'INFY', 'TCS', 'RELIANCE', 'HDFCBANK', 'ICICIBANK', 'SBIN',
+    'WIPRO', 'BHARTIARTL', 'ITC', 'HINDUNILVR', 'MARUTI', 'BAJFINANCE',
+    'KOTAKBANK', 'LT', 'AXISBANK', 'ASIANPAINT', 'NESTLEIND', 'HCLTECH',
+    'ULTRACEMCO', 'TATAMOTORS', 'SUNPHARMA', 'ONGC', 'TITAN', 'POWERGRID',
+    'NIFTY', 'SENSEX', 'BANKNIFTY'
+})
+
+# Whole uppercase words that could be symbols
+_SYMBOL_TOKEN_RE = re.compile(r'\b[A-Z]{2,}\b')
+
+# Publisher host (without 'www.') -> display name
+_SOURCE_NAMES = {
+    'economictimes.indiatimes.com': 'Economic Times',
+    'moneycontrol.com': 'MoneyControl',
+    'ndtvprofit.com': 'NDTV Profit',
+    'business-standard.com': 'Business Standard',
+    'livemint.com': 'LiveMint',
+}
+
+# Headline tokens considered for trending topics, minus words that appear in nearly every headline
+_TOPIC_TOKEN_RE = re.compile(r'\b[a-zA-Z]{4,}\b')
+_TOPIC_STOPWORDS = frozenset({'india', 'stock', 'share', 'market', 'company', 'news'})
+
+def _keyword_pattern(words: Tuple[str, ...]) -> re.Pattern:
+    """Compile keywords into one case-insensitive alternation anchored at word starts."""
+    # Longest first so e.g. 'underperform' wins over any shorter keyword sharing its prefix
+    alternation = '|'.join(map(re.escape, sorted(words, key=len, reverse=True)))
+    return re.compile(r'\b(?:' + alternation + ')', re.IGNORECASE)
+
+# One regex pass per polarity instead of a substring scan per keyword
+_POSITIVE_RE = _keyword_pattern(POSITIVE_KEYWORDS)
+_NEGATIVE_RE = _keyword_pattern(NEGATIVE_KEYWORDS)
+
+def _build_news_matcher():
+    """Aho-Corasick automaton over uppercased symbols and sentiment keywords, or None without pyahocorasick."""
+    if not AHOCORASICK_AVAILABLE:
+        return None
+    
+    terms = {}
+    for kind, words in (('sym', KNOWN_SYMBOLS),
+                        ('pos', POSITIVE_KEYWORDS),
+                        ('neg', NEGATIVE_KEYWORDS)):
+        for word in words:
+            terms.setdefault(word.upper(), []).append((kind, word))
+    
+    automaton = ahocorasick.Automaton()
+    for term, tags in terms.items():
+        automaton.add_word(term, (len(term), tags))
+    automaton.make_automaton()
+    return automaton
+
+# Single automaton over symbols and keywords, so each article is scanned once
+_NEWS_MATCHER = _build_news_matcher()
+
+def _html_to_text(content: str) -> str:
+    """Visible text of an HTML fragment, with whitespace collapsed to single spaces."""
+    # Most feed summaries are already plain text; skip the parser for them
+    if '<' not in content and '&' not in content:
+        return ' '.join(content.split())
+    
+    if LXML_AVAILABLE:
+        fragment = lxml.html.fragment_fromstring(content, create_parent='div')
+        return ' '.join(' '.join(fragment.itertext()).split())
+    
+    return BeautifulSoup(content, 'html.parser').get_text(' ', strip=True)
+
 class MCPRSSServer:
     """MCP server for RSS news operations."""
     
+    # Seconds a fetched feed is served without asking the publisher again
+    FEED_CACHE_TTL = 60
+    # Seconds a parsed get_market_news result is reused for the same limit
+    NEWS_CACHE_TTL = 60
+    # Parsed entries kept for reuse across fetches, oldest evicted first
+    ENTRY_CACHE_SIZE = 2048
+    
     def __init__(self):
         self.logger = logging.getLogger(__name__)
-        self.session = requests.Session()
         
-        # RSS feeds
-        self.rss_feeds = [
-            'https://economictimes.indiatimes.com/markets/rssfeeds/1977021501.cms',
-            'https://www.moneycontrol.com/rss/business.xml',
-            'https://feeds.feedburner.com/ndtvprofit-latest',
-            'https://www.business-standard.com/rss/markets-106.rss',
-            'https://www.livemint.com/rss/markets'
-        ]
+        # feed url -> (fetched_at, etag, last_modified, parsed feed); entries outlive the
+        # TTL so their validators can turn the next fetch into a conditional GET
+        self._cache_lock = threading.Lock()
+        self._feed_cache: Dict[str, Tuple[float, Optional[str], Optional[str], Any]] = {}
+        self._news_cache: Dict[int, Tuple[float, List[Dict[str, Any]]]] = {}
+        self._entry_cache: 'OrderedDict[Tuple[str, str, str], Dict[str, Any]]' = OrderedDict()
         
-        # Sentiment keywords
-        self.positive_keywords = [
-            'profit', 'growth', 'gain', 'rise', 'surge', 'bullish', 'positive',
-            'upgrade', 'beat', 'strong', 'excellent', 'good', 'buy', 'outperform'
-        ]
+        self.session = requests.Session()
+        self.session.headers['User-Agent'] = feedparser.USER_AGENT
         
-        self.negative_keywords = [
-            'loss', 'decline', 'fall', 'drop', 'bearish', 'negative', 'weak',
-            'downgrade', 'miss', 'poor', 'bad', 'sell', 'underperform', 'crash'
-        ]
+        # Keep-alive pool sized to the fetch threads, so repeat fetches skip the TCP/TLS handshake
+        adapter = HTTPAdapter(pool_connections=8, pool_maxsize=8)
+        self.session.mount('https://', adapter)
+        self.session.mount('http://', adapter)
     
     def handle_request(self, request: Dict[str, Any]) -> Dict[str, Any]:
         """Handle JSON-RPC request."""
@@ -88,15 +206,43 @@ class MCPRSSServer:
     def get_market_news(self, limit: int = 20) -> List[Dict[str, Any]]:
         """Get latest market news from RSS feeds."""
         try:
+            # Back-to-back calls (trending topics, stock news) reuse the parsed list
+            cached = self._cache_get(self._news_cache, limit, self.NEWS_CACHE_TTL)
+            if cached is not None:
+                return list(cached)
+            
             all_news = []
             
-            for feed_url in self.rss_feeds:
+            # Fetch all feeds concurrently; each parse is dominated by network I/O
+            feeds = {}
+            futures = {}
+            for feed_url in RSS_FEEDS:
+                self.logger.info(f"Parsing RSS feed: {feed_url}")
+                futures[_EXECUTOR.submit(self._fetch_feed, feed_url)] = feed_url
+            
+            try:
+                for future in as_completed(futures, timeout=FEED_TIMEOUT):
+                    feed_url = futures[future]
+                    try:
+                        feeds[feed_url] = future.result()
+                    except Exception as e:
+                        self.logger.warning(f"Failed to parse RSS feed {feed_url}: {str(e)}")
+            except FuturesTimeoutError:
+                pending = [url for future, url in futures.items() if not future.done()]
+                self.logger.warning(f"Timed out waiting for RSS feeds: {', '.join(pending)}")
+            
+            # Walk feeds in configured order so results don't depend on completion order
+            per_feed = limit // len(RSS_FEEDS) + 2
+            # One timestamp for the whole batch instead of a clock read per entry
+            now_iso = datetime.now().isoformat()
+            for feed_url in RSS_FEEDS:
+                feed = feeds.get(feed_url)
+                if feed is None:
+                    continue
                 try:
-                    self.logger.info(f"Parsing RSS feed: {feed_url}")
-                    feed = feedparser.parse(feed_url)
-                    
-                    for entry in feed.entries[:limit//len(self.rss_feeds) + 2]:
-                        news_item = self._parse_news_entry(entry, feed_url)
+                    # Stop after per_feed entries without copying the entry list
+                    for entry in islice(feed.entries, per_feed):
+                        news_item = self._parse_news_entry(entry, feed_url, now_iso)
                         if news_item:
                             all_news.append(news_item)
                             
@@ -106,15 +252,87 @@ class MCPRSSServer:
             
             # Sort by published date and limit
             all_news.sort(key=lambda x: x.get('published_date', ''), reverse=True)
-            return all_news[:limit]
+            news = all_news[:limit]
+            
+            if news:
+                self._cache_put(self._news_cache, limit, news)
+            return list(news)
             
         except Exception as e:
             self.logger.error(f"Error getting market news: {str(e)}")
             return []
     
-    def _parse_news_entry(self, entry, source_url: str) -> Optional[Dict[str, Any]]:
-        """Parse a single news entry from RSS feed."""
+    def _cache_get(self, cache: Dict, key: Any, ttl: float) -> Optional[Any]:
+        """Return a cached value if it is younger than ttl seconds."""
+        with self._cache_lock:
+            entry = cache.get(key)
+            if entry is None:
+                return None
+            
+            stored_at, value = entry
+            if time.monotonic() - stored_at > ttl:
+                cache.pop(key, None)
+                return None
+            
+            return value
+    
+    def _cache_put(self, cache: Dict, key: Any, value: Any):
+        """Store a value in an in-process cache."""
+        with self._cache_lock:
+            cache[key] = (time.monotonic(), value)
+    
+    def _fetch_feed(self, feed_url: str) -> feedparser.FeedParserDict:
+        """Download a feed over the pooled session and parse the raw bytes, reusing unchanged feeds."""
+        with self._cache_lock:
+            cached = self._feed_cache.get(feed_url)
+        
+        request_headers = {}
+        if cached:
+            fetched_at, etag, modified, feed = cached
+            if time.monotonic() - fetched_at < self.FEED_CACHE_TTL:
+                return feed
+            if etag:
+                request_headers['If-None-Match'] = etag
+            if modified:
+                request_headers['If-Modified-Since'] = modified
+        
+        response = self.session.get(feed_url, headers=request_headers, timeout=FEED_TIMEOUT)
+        
+        # 304: the publisher has nothing new, keep the parsed copy and restart its TTL
+        if response.status_code == 304 and cached:
+            with self._cache_lock:
+                self._feed_cache[feed_url] = (time.monotonic(),) + cached[1:]
+            return cached[3]
+        
+        response.raise_for_status()
+        
+        headers = {key.lower(): value for key, value in response.headers.items()}
+        headers['content-location'] = response.url
+        feed = feedparser.parse(response.content, response_headers=headers)
+        
+        with self._cache_lock:
+            self._feed_cache[feed_url] = (
+                time.monotonic(), headers.get('etag'), headers.get('last-modified'), feed
+            )
+        return feed
+    
+    def _parse_news_entry(self, entry, source_url: str,
+                          now_iso: Optional[str] = None) -> Optional[Dict[str, Any]]:
+        """Parse a single news entry from RSS feed, stamped with now_iso (default: now)."""
         try:
+            timestamp = now_iso or datetime.now().isoformat()
+            
+            # Entries already parsed on an earlier fetch skip HTML stripping and scanning
+            entry_id = entry.get('id') or entry.get('link') or entry.get('title')
+            cache_key = (source_url, entry_id, entry.get('updated', '')) if entry_id else None
+            if cache_key:
+                with self._cache_lock:
+                    cached = self._entry_cache.get(cache_key)
+                    if cached is not None:
+                        self._entry_cache.move_to_end(cache_key)
+                if cached is not None:
+                    return dict(cached, timestamp=timestamp)
+            
             # Extract basic information
             title = entry.get('title', '').strip()
             summary = entry.get('summary', '').strip()
@@ -128,24 +346,30 @@ class MCPRSSServer:
             # Get full content if available
             content = self._extract_content(entry)
             
-            # Extract related stock symbols
-            symbols = self._extract_stock_symbols(title + ' ' + summary + ' ' + content)
-            
-            # Calculate sentiment score
-            sentiment = self._calculate_sentiment(title + ' ' + summary + ' ' + content)
+            # Extract related stock symbols and sentiment score from one combined text
+            blob = f"{title} {summary} {content}"
+            symbols, sentiment = self._scan(blob)
             
-            return {
+            news_item = {
                 'title': title,
                 'summary': summary,
                 'content': content,
                 'url': link,
-                'source': self._get_source_name(source_url),
+                'source': FEED_SOURCES.get(source_url) or self._get_source_name(source_url),
                 'published_date': published_date.isoformat() if published_date else None,
                 'symbols': symbols,
                 'sentiment': sentiment,
-                'timestamp': datetime.now().isoformat()
+                'timestamp': timestamp
             }
             
+            if cache_key:
+                with self._cache_lock:
+                    self._entry_cache[cache_key] = news_item
+                    if len(self._entry_cache) > self.ENTRY_CACHE_SIZE:
+                        self._entry_cache.popitem(last=False)
+            
+            return dict(news_item)
+            
         except Exception as e:
             self.logger.warning(f"Failed to parse news entry: {str(e)}")
             return None
@@ -165,8 +389,7 @@ class MCPRSSServer:
             
             # Clean HTML tags
             if content:
-                soup = BeautifulSoup(content, 'html.parser')
-                content = soup.get_text(strip=True)
+                content = _html_to_text(content)
             
             return content[:1000]  # Limit content length
             
@@ -177,24 +400,9 @@ class MCPRSSServer:
     def _extract_stock_symbols(self, text: str) -> List[str]:
         """Extract stock symbols mentioned in the text."""
         try:
-            symbols = []
-            
-            # Known stock symbols to look for
-            known_symbols = [
-                'INFY', 'TCS', 'RELIANCE', 'HDFCBANK', 'ICICIBANK', 'SBIN',
-                'WIPRO', 'BHARTIARTL', 'ITC', 'HINDUNILVR', 'MARUTI', 'BAJFINANCE',
-                'KOTAKBANK', 'LT', 'AXISBANK', 'ASIANPAINT', 'NESTLEIND', 'HCLTECH',
-                'ULTRACEMCO', 'TATAMOTORS', 'SUNPHARMA', 'ONGC', 'TITAN', 'POWERGRID',
-                'NIFTY', 'SENSEX', 'BANKNIFTY'
-            ]
-            
-            text_upper = text.upper()
-            
-            for symbol in known_symbols:
-                if symbol in text_upper:
-                    symbols.append(symbol)
-            
-            return list(set(symbols))  # Remove duplicates
+            # Tokenize once and intersect, so 'LT' no longer matches inside 'BOLT'
+            tokens = set(_SYMBOL_TOKEN_RE.findall(text.upper()))
+            return list(KNOWN_SYMBOLS.intersection(tokens))
             
         except Exception as e:
             self.logger.warning(f"Failed to extract stock symbols: {str(e)}")
@@ -203,43 +411,66 @@ class MCPRSSServer:
     def _calculate_sentiment(self, text: str) -> float:
         """Calculate sentiment score for the text (-1.0 to 1.0)."""
         try:
-            text_lower = text.lower()
-            
-            positive_count = sum(1 for word in self.positive_keywords if word in text_lower)
-            negative_count = sum(1 for word in self.negative_keywords if word in text_lower)
-            
-            total_words = len(text.split())
+            # Each keyword counts once however often it appears
+            positive_count = len({match.lower() for match in _POSITIVE_RE.findall(text)})
+            negative_count = len({match.lower() for match in _NEGATIVE_RE.findall(text)})
             
-            if total_words == 0:
-                return 0.0
+            return self._sentiment_score(positive_count, negative_count, text)
             
-            # Calculate sentiment score
-            sentiment_score = (positive_count - negative_count) / max(total_words / 10, 1)
+        except Exception as e:
+            self.logger.warning(f"Failed to calculate sentiment: {str(e)}")
+            return 0.0
+    
+    def _sentiment_score(self, positive_count: int, negative_count: int, text: str) -> float:
+        """Turn keyword counts into a score scaled by text length (-1.0 to 1.0)."""
+        total_words = len(text.split())
+        
+        if total_words == 0:
+            return 0.0
+        
+        # Calculate sentiment score
+        sentiment_score = (positive_count - negative_count) / max(total_words / 10, 1)
+        
+        # Normalize to -1.0 to 1.0 range
+        sentiment_score = max(-1.0, min(1.0, sentiment_score))
+        
+        return round(sentiment_score, 3)
+    
+    def _scan(self, text: str) -> Tuple[List[str], float]:
+        """Stock symbols mentioned in the text and its sentiment score, from a single pass."""
+        if _NEWS_MATCHER is None:
+            return self._extract_stock_symbols(text), self._calculate_sentiment(text)
+        
+        try:
+            text_upper = text.upper()
+            found = {'sym': set(), 'pos': set(), 'neg': set()}
             
-            # Normalize to -1.0 to 1.0 range
-            sentiment_score = max(-1.0, min(1.0, sentiment_score))
+            for end, (length, tags) in _NEWS_MATCHER.iter(text_upper):
+                start = end - length + 1
+                # Keywords must start a word and symbols must be whole words, as on the regex path
+                if start > 0 and (text_upper[start - 1].isalnum() or text_upper[start - 1] == '_'):
+                    continue
+                at_word_end = end + 1 == len(text_upper) or not (
+                    text_upper[end + 1].isalnum() or text_upper[end + 1] == '_'
+                )
+                for kind, word in tags:
+                    if kind != 'sym' or at_word_end:
+                        found[kind].add(word)
             
-            return round(sentiment_score, 3)
+            sentiment = self._sentiment_score(len(found['pos']), len(found['neg']), text)
+            return list(found['sym']), sentiment
             
         except Exception as e:
-            self.logger.warning(f"Failed to calculate sentiment: {str(e)}")
-            return 0.0
+            self.logger.warning(f"Failed to scan news text: {str(e)}")
+            return [], 0.0
     
     def _get_source_name(self, url: str) -> str:
         """Extract source name from URL."""
         try:
-            if 'economictimes' in url:
-                return 'Economic Times'
-            elif 'moneycontrol' in url:
-                return 'MoneyControl'
-            elif 'ndtv' in url:
-                return 'NDTV Profit'
-            elif 'business-standard' in url:
-                return 'Business Standard'
-            elif 'livemint' in url:
-                return 'LiveMint'
-            else:
-                return 'Unknown'
+            host = urlsplit(url).hostname or ''
+            if host.startswith('www.'):
+                host = host[4:]
+            return _SOURCE_NAMES.get(host, 'Unknown')
         except:
             return 'Unknown'
     
@@ -248,11 +479,15 @@ class MCPRSSServer:
         try:
             all_news = self.get_market_news(limit * 3)  # Get more to filter
             
+            # Case the symbol once rather than on every comparison
+            symbol_upper = symbol.upper()
+            symbol_lower = symbol.lower()
+            
             stock_news = []
             for news in all_news:
-                if (symbol.upper() in news.get('symbols', []) or 
-                    symbol.lower() in news.get('title', '').lower() or
-                    symbol.lower() in news.get('content', '').lower()):
+                if (symbol_upper in news.get('symbols', []) or 
+                    symbol_lower in news.get('title', '').lower() or
+                    symbol_lower in news.get('content', '').lower()):
                     stock_news.append(news)
                     
                 if len(stock_news) >= limit:
@@ -298,49 +533,45 @@ class MCPRSSServer:
         try:
             news_items = self.get_market_news(100)
             
-            # Extract keywords from titles
-            word_counts = {}
+            # Extract keywords from titles, summing each word's headline sentiment in the same pass
+            word_counts = Counter()
+            sentiment_sums = {}
+            sentiment_counts = Counter()
             
             for news in news_items:
                 title = news.get('title', '').lower()
-                words = re.findall(r'\b[a-zA-Z]{4,}\b', title)
+                words = [
+                    word for word in _TOPIC_TOKEN_RE.findall(title)
+                    if word not in _TOPIC_STOPWORDS
+                ]
+                
+                word_counts.update(words)
                 
-                for word in words:
-                    if word not in ['india', 'stock', 'share', 'market', 'company', 'news']:
-                        word_counts[word] = word_counts.get(word, 0) + 1
+                # Each headline contributes its sentiment once per distinct word
+                sentiment = news.get('sentiment', 0.0)
+                for word in set(words):
+                    sentiment_sums[word] = sentiment_sums.get(word, 0.0) + sentiment
+                    sentiment_counts[word] += 1
             
-            # Sort by frequency
-            trending = sorted(word_counts.items(), key=lambda x: x[1], reverse=True)
+            # Top words by frequency via a heap, rather than sorting every distinct word
+            trending = word_counts.most_common(limit)
             
             return [
                 {
                     'topic': word,
                     'frequency': count,
-                    'sentiment': self._get_topic_sentiment(word, news_items)
+                    'sentiment': round(sentiment_sums[word] / sentiment_counts[word], 3)
                 }
-                for word, count in trending[:limit]
+                for word, count in trending
             ]
             
         except Exception as e:
             self.logger.error(f"Error getting trending topics: {str(e)}")
             return []
-    
-    def _get_topic_sentiment(self, topic: str, news_items: List[Dict]) -> float:
-        """Get average sentiment for a topic."""
-        try:
-            topic_sentiments = []
-            
-            for news in news_items:
-                if topic.lower() in news.get('title', '').lower():
-                    topic_sentiments.append(news.get('sentiment', 0.0))
-            
-            if topic_sentiments:
-                return round(sum(topic_sentiments) / len(topic_sentiments), 3)
-            
-            return 0.0
-            
-        except:
-            return 0.0
+
+def _dumps(payload: Any) -> bytes:
+    """Serialize a response with orjson, straight to bytes; unknown types fall back to str."""
+    return orjson.dumps(payload, default=str)
 
 def run_server(port: int = 8002):
     """Run the MCP RSS server."""
@@ -349,24 +580,25 @@ def run_server(port: int = 8002):
     print(f"MCP RSS Server starting on port {port}")
     
     try:
-        from http.server import HTTPServer, BaseHTTPRequestHandler
-        import json
+        from http.server import ThreadingHTTPServer, BaseHTTPRequestHandler
         
         class MCPHandler(BaseHTTPRequestHandler):
             def do_POST(self):
                 try:
                     content_length = int(self.headers['Content-Length'])
                     post_data = self.rfile.read(content_length)
-                    request = json.loads(post_data.decode('utf-8'))
+                    request = orjson.loads(post_data)
                     
                     response = server.handle_request(request)
+                    response_data = _dumps(response)
                     
                     self.send_response(200)
                     self.send_header('Content-type', 'application/json')
+                    self.send_header('Content-Length', str(len(response_data)))
                     self.send_header('Access-Control-Allow-Origin', '*')
                     self.end_headers()
                     
-                    self.wfile.write(json.dumps(response).encode('utf-8'))
+                    self.wfile.write(response_data)
                     
                 except Exception as e:
                     self.send_response(500)
@@ -382,7 +614,7 @@ def run_server(port: int = 8002):
                         }
                     }
                     
-                    self.wfile.write(json.dumps(error_response).encode('utf-8'))
+                    self.wfile.write(_dumps(error_response))
             
             def do_OPTIONS(self):
                 self.send_response(200)
@@ -391,7 +623,8 @@ def run_server(port: int = 8002):
                 self.send_header('Access-Control-Allow-Headers', 'Content-Type')
                 self.end_headers()
         
-        httpd = HTTPServer(('localhost', port), MCPHandler)
+        # One thread per request, so other clients don't queue behind a slow feed fetch
+        httpd = ThreadingHTTPServer(('localhost', port), MCPHandler)
         print(f"MCP RSS Server running on http://localhost:{port}")
         httpd.serve_forever()
         
@@ -3,14 +3,17 @@ Portfolio and Stock models for MongoDB collections
 """
 from datetime import datetime, timezone
 from typing import Dict, List, Optional, Any
+import atexit
 import logging
+import threading
 
 # Initialize logger
 logger = logging.getLogger(__name__)
 
 # Safe imports with fallbacks
 try:
-    from pymongo import MongoClient
+    from pymongo import MongoClient, InsertOne, WriteConcern
+    from pymongo.errors import BulkWriteError, ConnectionFailure
     from bson import ObjectId
     from config import Config
     MONGO_AVAILABLE = True
@@ -20,23 +23,125 @@ except ImportError as e:
     MONGO_AVAILABLE = False
     Config = None
     MongoClient = None
+    InsertOne = None
+    WriteConcern = None
+    BulkWriteError = None
+    ConnectionFailure = None
     ObjectId = None
 
 # Global database client
 db_client = None
 
-def init_db():
-    """Initialize the database connection."""
-    global db_client
+# Writes are queued and flushed with insert_many, so bursts cost one round trip per batch
+FLUSH_INTERVAL = 0.1  # seconds
+FLUSH_BATCH_SIZE = 500
+# Documents kept queued per collection while the server is unreachable; older ones are dropped beyond this
+MAX_PENDING = 10 * FLUSH_BATCH_SIZE
+_pending_recs: List[Dict[str, Any]] = []
+_pending_stocks: List[Dict[str, Any]] = []
+_pending_lock = threading.Lock()
+# Held across each flush's insert_many, so a reader's flush waits for a batch already in flight
+_flush_lock = threading.Lock()
+_flush_wakeup = threading.Event()
+_flusher = None
+
+def _flush_pending(collection_name: str, pending: List[Dict[str, Any]]):
+    """Insert every queued document for one collection in a single unordered batch."""
+    with _flush_lock:
+        with _pending_lock:
+            if not pending:
+                return
+            batch = pending[:]
+            pending.clear()
+        
+        try:
+            db = get_db()
+            if db is not None:
+                db[collection_name].insert_many(batch, ordered=False)
+        except BulkWriteError as e:
+            # Unordered, so every other document was written; only the rejected ones are lost.
+            # Duplicate keys mean an earlier attempt already stored the document.
+            errors = [err for err in e.details.get('writeErrors', []) if err.get('code') != 11000]
+            for err in errors:
+                logger.error(f"Dropped document {batch[err['index']].get('_id')} from {collection_name}: {err.get('errmsg')}")
+        except ConnectionFailure as e:
+            # Server unreachable: put the batch back in front of newer writes and retry on the next flush
+            with _pending_lock:
+                pending[:0] = batch
+                overflow = len(pending) - MAX_PENDING
+                if overflow > 0:
+                    del pending[:overflow]
+            logger.warning(f"Deferred {len(batch)} documents for {collection_name}: {e}")
+            if overflow > 0:
+                logger.error(f"Dropped {overflow} queued documents for {collection_name}; queue is full")
+        except Exception as e:
+            logger.error(f"Error flushing {len(batch)} documents to {collection_name}: {e}")
+
+def flush_all():
+    """Write all queued recommendations and stock data now (call before shutdown)."""
+    _flush_pending('recommendations', _pending_recs)
+    _flush_pending('stock_data', _pending_stocks)
+
+def _flush_loop():
+    """Background writer: flush every FLUSH_INTERVAL, or sooner when a queue fills up."""
+    while True:
+        _flush_wakeup.wait(FLUSH_INTERVAL)
+        _flush_wakeup.clear()
+        flush_all()
+
+def _enqueue(pending: List[Dict[str, Any]], document: Dict[str, Any]):
+    """Queue a document for the background writer."""
+    with _pending_lock:
+        pending.append(document)
+        full = len(pending) >= FLUSH_BATCH_SIZE
+    if full:
+        _flush_wakeup.set()
+
+# Documents are pulled from the server in batches of this size
+READ_BATCH_SIZE = 200
+
+# get_stock_history returns the price series only, not source/metadata
+STOCK_HISTORY_FIELDS = ['symbol', 'price', 'volume', 'change', 'change_percent', 'timestamp']
+
+def _projection(fields: Optional[List[str]]) -> Optional[Dict[str, int]]:
+    """Mongo projection returning only the given fields, or None for whole documents."""
+    return {field: 1 for field in fields} if fields else None
+
+def _ensure_indexes():
+    """Create the indexes behind the newest-first reads, so they avoid a collection scan and in-memory sort."""
+    try:
+        db = get_db()
+        if db is None:
+            return
+        
+        # get_all_recommendations: newest first
+        db.recommendations.create_index([("timestamp", -1)])
+        # get_recommendations_by_symbol / get_stock_history: symbol equality, newest first
+        db.recommendations.create_index([("symbol", 1), ("timestamp", -1)])
+        db.stock_data.create_index([("symbol", 1), ("timestamp", -1)])
+    except Exception as e:
+        logger.error(f"Error creating indexes: {e}")
+
+def init_db(client=None):
+    """Initialize the database connection, optionally reusing an existing MongoClient."""
+    global db_client, _flusher
     try:
         if MONGO_AVAILABLE and Config:
-            if hasattr(Config, 'MONGODB_URI'):
-                db_client = MongoClient(Config.MONGODB_URI)
+            if client is not None or getattr(Config, 'MONGODB_URL', None):
+                db_client = client if client is not None else MongoClient(
+                    Config.MONGODB_URL, serverSelectionTimeoutMS=5000
+                )
                 # Test connection
                 db_client.admin.command('ping')
                 logger.info("MongoDB connection established")
+                _ensure_indexes()
+                
+                if _flusher is None:
+                    _flusher = threading.Thread(target=_flush_loop, name='mongo-flusher', daemon=True)
+                    _flusher.start()
+                    atexit.register(flush_all)
             else:
-                logger.warning("MONGODB_URI not found in config")
+                logger.warning("MONGODB_URL not found in config")
         else:
             logger.warning("MongoDB not available - running in mock mode")
     except Exception as e:
@@ -49,6 +154,49 @@ def get_db():
         return db_client[Config.MONGODB_NAME]
     return None
 
+def _recommendation_doc(symbol: str, action: str, reasoning: str,
+                        confidence: float = 0.5, metadata: Dict = None) -> Dict[str, Any]:
+    """Build a recommendation document with a client-side _id."""
+    now = datetime.now(timezone.utc)
+    return {
+        'symbol': symbol,
+        'action': action,
+        'reasoning': reasoning,
+        'confidence': confidence,
+        'metadata': metadata or {},
+        'timestamp': now,
+        'created_at': now,
+        # Assigned client-side so callers get the _id before the batch is written
+        '_id': ObjectId()
+    }
+
+def _stock_data_doc(symbol: str, price: float, volume: int = None,
+                    change: float = None, change_percent: float = None,
+                    source: str = "API", metadata: Dict = None) -> Dict[str, Any]:
+    """Build a stock data document with a client-side _id."""
+    return {
+        'symbol': symbol,
+        'price': price,
+        'volume': volume,
+        'change': change,
+        'change_percent': change_percent,
+        'source': source,
+        'metadata': metadata or {},
+        'timestamp': datetime.now(timezone.utc),
+        '_id': ObjectId()
+    }
+
+def _bulk_insert(collection_name: str, documents: List[Dict[str, Any]], relaxed_write: bool = False):
+    """Insert documents in one unordered bulk write.
+    
+    relaxed_write acknowledges on the primary alone (w=1, no journal wait) instead of
+    the client's default write concern; meant for throwaway data such as setup fixtures.
+    """
+    collection = get_db()[collection_name]
+    if relaxed_write:
+        collection = collection.with_options(write_concern=WriteConcern(w=1, j=False))
+    collection.bulk_write([InsertOne(doc) for doc in documents], ordered=False)
+
 def save_recommendation(symbol: str, action: str, reasoning: str, 
                        confidence: float = 0.5, metadata: Dict = None) -> Dict[str, Any]:
     """Save a recommendation to the database."""
@@ -65,19 +213,10 @@ def save_recommendation(symbol: str, action: str, reasoning: str,
                 '_id': 'mock_id_' + symbol
             }
         
-        recommendation = {
-            'symbol': symbol,
-            'action': action,
-            'reasoning': reasoning,
-            'confidence': confidence,
-            'metadata': metadata or {},
-            'timestamp': datetime.now(timezone.utc),
-            'created_at': datetime.now(timezone.utc)
-        }
+        recommendation = _recommendation_doc(symbol, action, reasoning, confidence, metadata)
         
-        result = db.recommendations.insert_one(recommendation)
-        recommendation['_id'] = result.inserted_id
-        logger.info(f"Saved recommendation for {symbol}: {action}")
+        _enqueue(_pending_recs, recommendation)
+        logger.info(f"Queued recommendation for {symbol}: {action}")
         return recommendation
     except Exception as e:
         logger.error(f"Error saving recommendation: {e}")
@@ -91,8 +230,15 @@ def save_recommendation(symbol: str, action: str, reasoning: str,
             '_id': 'error_mock_' + symbol
         }
 
-def get_all_recommendations(limit: int = 50, offset: int = 0) -> List[Dict[str, Any]]:
-    """Get all recommendations from the database."""
+def get_all_recommendations(limit: int = 50, offset: int = 0,
+                            before: Optional[datetime] = None,
+                            fields: Optional[List[str]] = None) -> List[Dict[str, Any]]:
+    """Get all recommendations from the database, newest first.
+    
+    Pass the timestamp of the last recommendation already shown as `before` to page
+    by range on the timestamp index; offset pages must skip every earlier document.
+    Pass `fields` to fetch only those fields (plus _id) instead of whole documents.
+    """
     try:
         db = get_db()
         if db is None:
@@ -108,20 +254,30 @@ def get_all_recommendations(limit: int = 50, offset: int = 0) -> List[Dict[str,
                 }
             ]
         
-        cursor = db.recommendations.find().sort("timestamp", -1).skip(offset).limit(limit)
+        # Reads see this process's own queued writes
+        _flush_pending('recommendations', _pending_recs)
+        projection = _projection(fields)
+        if before is not None:
+            cursor = db.recommendations.find({"timestamp": {"$lt": before}}, projection).sort("timestamp", -1).limit(limit)
+        else:
+            cursor = db.recommendations.find({}, projection).sort("timestamp", -1).skip(offset).limit(limit)
+        cursor = cursor.batch_size(READ_BATCH_SIZE)
         return list(cursor)
     except Exception as e:
         logger.error(f"Error getting recommendations: {e}")
         return []
 
-def get_recommendations_by_symbol(symbol: str, limit: int = 10) -> List[Dict[str, Any]]:
-    """Get recommendations for a specific symbol."""
+def get_recommendations_by_symbol(symbol: str, limit: int = 10,
+                                  fields: Optional[List[str]] = None) -> List[Dict[str, Any]]:
+    """Get recommendations for a specific symbol, optionally only the given fields."""
     try:
         db = get_db()
         if db is None:
             return []
         
-        cursor = db.recommendations.find({"symbol": symbol}).sort("timestamp", -1).limit(limit)
+        _flush_pending('recommendations', _pending_recs)
+        cursor = db.recommendations.find({"symbol": symbol}, _projection(fields)).sort("timestamp", -1).limit(limit)
+        cursor = cursor.batch_size(READ_BATCH_SIZE)
         return list(cursor)
     except Exception as e:
         logger.error(f"Error getting recommendations for {symbol}: {e}")
@@ -146,20 +302,10 @@ def save_stock_data(symbol: str, price: float, volume: int = None,
                 '_id': 'mock_stock_' + symbol
             }
         
-        stock_data = {
-            'symbol': symbol,
-            'price': price,
-            'volume': volume,
-            'change': change,
-            'change_percent': change_percent,
-            'source': source,
-            'metadata': metadata or {},
-            'timestamp': datetime.now(timezone.utc)
-        }
+        stock_data = _stock_data_doc(symbol, price, volume, change, change_percent, source, metadata)
         
-        result = db.stock_data.insert_one(stock_data)
-        stock_data['_id'] = result.inserted_id
-        logger.info(f"Saved stock data for {symbol}: ${price}")
+        _enqueue(_pending_stocks, stock_data)
+        logger.info(f"Queued stock data for {symbol}: ${price}")
         return stock_data
     except Exception as e:
         logger.error(f"Error saving stock data: {e}")
@@ -172,14 +318,78 @@ def save_stock_data(symbol: str, price: float, volume: int = None,
             '_id': 'error_stock_' + symbol
         }
 
-def get_stock_history(symbol: str, limit: int = 100) -> List[Dict[str, Any]]:
-    """Get historical stock data for a symbol."""
+def save_recommendations_bulk(recommendations: List[tuple], relaxed_write: bool = False) -> List[Dict[str, Any]]:
+    """Save several recommendations, each a tuple of save_recommendation arguments, in one round trip."""
+    try:
+        if get_db() is None:
+            return [save_recommendation(*args) for args in recommendations]
+        
+        documents = [_recommendation_doc(*args) for args in recommendations]
+        if documents:
+            _bulk_insert('recommendations', documents, relaxed_write)
+        logger.info(f"Saved {len(documents)} recommendations")
+        return documents
+    except Exception as e:
+        logger.error(f"Error saving recommendations: {e}")
+        return []
+
+def save_stock_data_bulk(stock_data: List[tuple], relaxed_write: bool = False) -> List[Dict[str, Any]]:
+    """Save several stock data points, each a tuple of save_stock_data arguments, in one round trip."""
+    try:
+        if get_db() is None:
+            return [save_stock_data(*args) for args in stock_data]
+        
+        documents = [_stock_data_doc(*args) for args in stock_data]
+        if documents:
+            _bulk_insert('stock_data', documents, relaxed_write)
+        logger.info(f"Saved stock data for {len(documents)} symbols")
+        return documents
+    except Exception as e:
+        logger.error(f"Error saving stock data: {e}")
+        return []
+
+def save_news_data_bulk(news_items: List[tuple], relaxed_write: bool = False) -> List[Dict[str, Any]]:
+    """Save news items, each a (title, summary, url, source, sentiment, symbols) tuple, in one round trip."""
+    try:
+        now = datetime.now(timezone.utc)
+        documents = [
+            {
+                'title': title,
+                'summary': summary,
+                'url': url,
+                'source': source,
+                'sentiment': sentiment,
+                'symbols': symbols or [],
+                'timestamp': now
+            }
+            for title, summary, url, source, sentiment, symbols in news_items
+        ]
+        if get_db() is None:
+            return documents
+        
+        for document in documents:
+            document['_id'] = ObjectId()
+        if documents:
+            _bulk_insert('news_data', documents, relaxed_write)
+        logger.info(f"Saved {len(documents)} news items")
+        return documents
+    except Exception as e:
+        logger.error(f"Error saving news data: {e}")
+        return []
+
+def get_stock_history(symbol: str, limit: int = 100,
+                      fields: Optional[List[str]] = None) -> List[Dict[str, Any]]:
+    """Get historical stock data for a symbol (STOCK_HISTORY_FIELDS unless fields are given)."""
     try:
         db = get_db()
         if db is None:
             return []
         
-        cursor = db.stock_data.find({"symbol": symbol}).sort("timestamp", -1).limit(limit)
+        _flush_pending('stock_data', _pending_stocks)
+        projection = _projection(fields or STOCK_HISTORY_FIELDS)
+        projection['_id'] = 0
+        cursor = db.stock_data.find({"symbol": symbol}, projection).sort("timestamp", -1).limit(limit)
+        cursor = cursor.batch_size(READ_BATCH_SIZE)
         return list(cursor)
     except Exception as e:
         logger.error(f"Error getting stock history for {symbol}: {e}")
@@ -189,9 +399,13 @@ def get_stock_history(symbol: str, limit: int = 100) -> List[Dict[str, Any]]:
 __all__ = [
     'init_db',
     'get_db',
+    'flush_all',
     'save_recommendation',
     'get_all_recommendations', 
     'get_recommendations_by_symbol',
     'save_stock_data',
+    'save_recommendations_bulk',
+    'save_stock_data_bulk',
+    'save_news_data_bulk',
     'get_stock_history'
 ]
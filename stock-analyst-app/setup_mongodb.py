@@ -3,11 +3,57 @@
 MongoDB Setup Script for Stock Analyst App
 """
 
+import argparse
 import subprocess
 import sys
 import os
 from pathlib import Path
 
+# MongoClient shared by the connection test and sample data creation, so both use one warm pool
+_mongo_client = None
+
+def _get_mongo_client():
+    """Create the shared MongoClient on first use, with an explicitly sized connection pool."""
+    global _mongo_client
+    if _mongo_client is None:
+        from pymongo import MongoClient
+        from config import Config
+        
+        _mongo_client = MongoClient(
+            Config.MONGODB_URL,
+            # Short timeouts so an unreachable server fails the test in ~1.5 s, not 5 s
+            serverSelectionTimeoutMS=1500,
+            connectTimeoutMS=1500,
+            socketTimeoutMS=3000,
+            maxPoolSize=50,
+            minPoolSize=5,
+            maxIdleTimeMS=300000,
+            retryWrites=True,
+            w="majority"
+        )
+    return _mongo_client
+
+# Default .env contents written by setup_environment
+_ENV_TEMPLATE = """# MongoDB Configuration
+MONGODB_URL=mongodb://localhost:27017
+MONGODB_NAME=stock_analyst
+
+# AWS Bedrock Configuration
+AWS_REGION=us-east-1
+AWS_ACCESS_KEY_ID=your_aws_access_key
+AWS_SECRET_ACCESS_KEY=your_aws_secret_key
+
+# Application Settings
+FLASK_ENV=development
+FLASK_DEBUG=True
+SECRET_KEY=your-secret-key-here
+
+# MCP Server Ports
+FINANCE_SERVER_PORT=8001
+RSS_SERVER_PORT=8002
+DB_SERVER_PORT=8003
+"""
+
 def install_mongodb():
     """Instructions for installing MongoDB on Windows."""
     print("MongoDB Installation Instructions for Windows:")
@@ -29,84 +75,114 @@ def setup_environment():
     
     print("\nSetting up environment variables...")
     
-    # Default MongoDB settings
-    env_content = """# MongoDB Configuration
-MONGODB_URL=mongodb://localhost:27017
-MONGODB_NAME=stock_analyst
-
-# AWS Bedrock Configuration
-AWS_REGION=us-east-1
-AWS_ACCESS_KEY_ID=your_aws_access_key
-AWS_SECRET_ACCESS_KEY=your_aws_secret_key
-
-# Application Settings
-FLASK_ENV=development
-FLASK_DEBUG=True
-SECRET_KEY=your-secret-key-here
-
-# MCP Server Ports
-FINANCE_SERVER_PORT=8001
-RSS_SERVER_PORT=8002
-DB_SERVER_PORT=8003
-"""
-    
     if not env_file.exists():
-        with open(env_file, 'w') as f:
-            f.write(env_content)
+        env_file.write_text(_ENV_TEMPLATE, encoding="utf-8")
         print(f"Created {env_file} with default MongoDB settings")
     else:
         print(f"{env_file} already exists. Please verify MongoDB settings:")
         print("MONGODB_URL=mongodb://localhost:27017")
         print("MONGODB_NAME=stock_analyst")
 
+# Packages installed by setup
+_PACKAGES = (
+    "pymongo>=4.6.0",
+    "motor>=3.3.0",
+    "flask==2.3.3",
+    "boto3==1.34.0",
+    "requests==2.31.0",
+    "feedparser==6.0.11",
+    "pandas>=2.2.0",
+    "numpy>=1.26.0",
+    "matplotlib>=3.8.0",
+    "python-dotenv==1.0.0",
+    "yfinance>=0.2.32",
+    "beautifulsoup4==4.12.2",
+    "lxml>=4.9.3",
+    "schedule==1.2.0",
+)
+
+_REQUIREMENTS = Path("requirements.setup.txt")
+
+def _write_requirements(packages):
+    """Write packages to the requirements file, leaving it untouched when already current."""
+    content = "\n".join(packages) + "\n"
+    try:
+        if _REQUIREMENTS.read_text(encoding="utf-8") == content:
+            return
+    except OSError:
+        pass
+    _REQUIREMENTS.write_text(content, encoding="utf-8")
+
+def _unsatisfied(packages):
+    """Drop requirements the current environment already satisfies, so pip only sees the rest."""
+    try:
+        from importlib.metadata import version, PackageNotFoundError
+        from packaging.requirements import Requirement
+    except ImportError:
+        # Without packaging we cannot compare versions; let pip decide
+        return packages
+    
+    missing = []
+    for package in packages:
+        req = Requirement(package)
+        try:
+            if req.specifier.contains(version(req.name), prereleases=True):
+                continue
+        except PackageNotFoundError:
+            pass
+        missing.append(package)
+    return missing
+
 def install_python_packages():
     """Install required Python packages."""
     print("\nInstalling Python packages...")
     
-    packages = [
-        "pymongo>=4.6.0",
-        "motor>=3.3.0",
-        "flask==2.3.3",
-        "boto3==1.34.0",
-        "requests==2.31.0",
-        "feedparser==6.0.11",
-        "pandas>=2.2.0",
-        "numpy>=1.26.0",
-        "matplotlib>=3.8.0",
-        "python-dotenv==1.0.0",
-        "yfinance>=0.2.32",
-        "beautifulsoup4==4.12.2",
-        "lxml>=4.9.3",
-        "schedule==1.2.0"
-    ]
+    packages = _unsatisfied(_PACKAGES)
+    if not packages:
+        print("All packages are already installed.")
+        return
     
+    # One pip run resolves everything together instead of starting pip once per package
+    pip_install = [sys.executable, "-m", "pip", "install",
+                   "--disable-pip-version-check", "--no-input", "--prefer-binary"]
+    try:
+        # Only the missing requirements go to pip; the file changes only when that set does
+        _write_requirements(packages)
+        print(f"Installing {len(packages)} of {len(_PACKAGES)} packages from {_REQUIREMENTS}...")
+        subprocess.check_call(pip_install + ["-r", str(_REQUIREMENTS)])
+        return
+    except subprocess.CalledProcessError as e:
+        print(f"Batch install failed ({e}); retrying packages one at a time...")
+    
+    # Fall back to per-package installs so the failing package is identified
     for package in packages:
         try:
             print(f"Installing {package}...")
-            subprocess.check_call([sys.executable, "-m", "pip", "install", package])
+            subprocess.check_call(pip_install + [package])
         except subprocess.CalledProcessError as e:
             print(f"Error installing {package}: {e}")
 
 def test_mongodb_connection():
     """Test MongoDB connection."""
     try:
-        from pymongo import MongoClient
+        from pymongo import InsertOne, DeleteOne
         from config import Config
         
         print("\nTesting MongoDB connection...")
-        client = MongoClient(Config.MONGODB_URL, serverSelectionTimeoutMS=5000)
+        client = _get_mongo_client()
         
         # Test connection
         client.admin.command('ping')
         print("✅ MongoDB connection successful!")
         
-        # Test database access
+        # Test database access; insert and delete travel in one ordered batch
         db = client[Config.MONGODB_NAME]
-        db.test.insert_one({"test": "connection"})
-        db.test.delete_one({"test": "connection"})
+        db.test.bulk_write([
+            InsertOne({"test": "connection"}),
+            DeleteOne({"test": "connection"})
+        ])
         print("✅ Database operations successful!")
         
-        client.close()
         return True
         
     except Exception as e:
@@ -121,31 +197,52 @@ def create_sample_data():
     """Create sample data in MongoDB."""
     try:
         from models.portfolio import (
-            save_recommendation, save_stock_data, save_news_data
+            init_db, get_db, save_recommendations_bulk, save_stock_data_bulk, save_news_data_bulk
         )
-        from datetime import datetime
         
         print("\nCreating sample data...")
+        init_db(client=_get_mongo_client())
+        if get_db() is None:
+            print("❌ Error creating sample data: database is not connected")
+            return False
         
-        # Sample recommendations
-        save_recommendation("RELIANCE", "BUY", "Strong fundamentals and growth prospects", 0.85)
-        save_recommendation("TCS", "HOLD", "Stable but fairly valued", 0.65)
-        save_recommendation("INFY", "BUY", "Good quarterly results", 0.75)
+        recommendations = [
+            ("RELIANCE", "BUY", "Strong fundamentals and growth prospects", 0.85),
+            ("TCS", "HOLD", "Stable but fairly valued", 0.65),
+            ("INFY", "BUY", "Good quarterly results", 0.75),
+        ]
+        stock_data = [
+            ("RELIANCE", 2450.50, 1000000, 25.30, 1.04),
+            ("TCS", 3520.75, 500000, -15.25, -0.43),
+            ("INFY", 1680.20, 750000, 12.80, 0.77),
+        ]
+        news_items = [
+            (
+                "Market rallies on positive earnings",
+                "Indian stock markets gained today...",
+                "https://example.com/news1",
+                "Financial Express",
+                0.7,
+                ["RELIANCE", "TCS", "INFY"]
+            ),
+        ]
         
-        # Sample stock data
-        save_stock_data("RELIANCE", 2450.50, 1000000, 25.30, 1.04)
-        save_stock_data("TCS", 3520.75, 500000, -15.25, -0.43)
-        save_stock_data("INFY", 1680.20, 750000, 12.80, 0.77)
+        # One bulk write per collection instead of a round trip per document; sample
+        # data is throwaway, so skip waiting for the client's majority acknowledgement.
+        # The helpers log and return [] on failure, so compare what came back.
+        saved = [
+            ("recommendations", recommendations,
+             save_recommendations_bulk(recommendations, relaxed_write=True)),
+            ("stock data", stock_data,
+             save_stock_data_bulk(stock_data, relaxed_write=True)),
+            ("news items", news_items,
+             save_news_data_bulk(news_items, relaxed_write=True)),
+        ]
         
-        # Sample news
-        save_news_data(
-            "Market rallies on positive earnings",
-            "Indian stock markets gained today...",
-            "https://example.com/news1",
-            "Financial Express",
-            0.7,
-            ["RELIANCE", "TCS", "INFY"]
-        )
+        failed = [name for name, items, documents in saved if len(documents) != len(items)]
+        if failed:
+            print(f"❌ Error creating sample data: could not save {', '.join(failed)}")
+            return False
         
         print("✅ Sample data created successfully!")
         return True
@@ -154,8 +251,29 @@ def create_sample_data():
         print(f"❌ Error creating sample data: {e}")
         return False
 
-def main():
+def _parse_args(argv=None):
+    """Command-line options for running setup unattended."""
+    parser = argparse.ArgumentParser(description="Stock Analyst App - MongoDB setup")
+    parser.add_argument("--yes", "-y", action="store_true",
+                        help="run every step that is not skipped without asking")
+    parser.add_argument("--skip-install", action="store_true",
+                        help="do not install Python packages")
+    parser.add_argument("--skip-test", action="store_true",
+                        help="do not test the MongoDB connection (also skips sample data)")
+    parser.add_argument("--skip-sample-data", action="store_true",
+                        help="do not create sample data")
+    return parser.parse_args(argv)
+
+def _confirm(question, assume_yes):
+    """Ask a y/n question, or answer yes when --yes was given or stdin is not a terminal."""
+    if assume_yes or not sys.stdin.isatty():
+        return True
+    return input(f"\n{question} (y/n): ").lower() in ['y', 'yes']
+
+def main(argv=None):
     """Main setup function."""
+    args = _parse_args(argv)
+    
     print("Stock Analyst App - MongoDB Setup")
     print("=" * 40)
     
@@ -166,17 +284,14 @@ def main():
     setup_environment()
     
     # Step 3: Install packages
-    response = input("\nInstall Python packages? (y/n): ").lower()
-    if response in ['y', 'yes']:
+    if not args.skip_install and _confirm("Install Python packages?", args.yes):
         install_python_packages()
     
     # Step 4: Test connection
-    response = input("\nTest MongoDB connection? (y/n): ").lower()
-    if response in ['y', 'yes']:
+    if not args.skip_test and _confirm("Test MongoDB connection?", args.yes):
         if test_mongodb_connection():
             # Step 5: Create sample data
-            response = input("\nCreate sample data? (y/n): ").lower()
-            if response in ['y', 'yes']:
+            if not args.skip_sample_data and _confirm("Create sample data?", args.yes):
                 create_sample_data()
     
     print("\n" + "=" * 40)
@@ -7,18 +7,28 @@ import subprocess
 import sys
 import time
 import signal
+import socket
 import os
-from multiprocessing import Process
 
 def start_server(server_file, port):
-    """Start a single MCP server."""
-    try:
-        print(f"Starting {server_file} on port {port}...")
-        subprocess.run([sys.executable, server_file, str(port)], cwd="mcp_servers")
-    except KeyboardInterrupt:
-        print(f"\nStopping {server_file}...")
-    except Exception as e:
-        print(f"Error starting {server_file}: {e}")
+    """Launch a single MCP server as a child process and return its handle."""
+    print(f"Starting {server_file} on port {port}...")
+    return subprocess.Popen([sys.executable, server_file, str(port)], cwd="mcp_servers")
+
+def _wait_port(port, timeout=5.0, process=None):
+    """Wait until something accepts connections on localhost:port; False on timeout or if process exits."""
+    deadline = time.monotonic() + timeout
+    while time.monotonic() < deadline:
+        if process is not None and process.poll() is not None:
+            return False
+        with socket.socket() as s:
+            s.settimeout(0.1)
+            try:
+                s.connect(("127.0.0.1", port))
+                return True
+            except OSError:
+                time.sleep(0.05)
+    return False
 
 def main():
     """Start all MCP servers in parallel."""
@@ -31,31 +41,50 @@ def main():
     processes = []
     
     try:
-        # Start each server in a separate process
+        # Start each server directly as a child process
         for server_file, port in servers:
-            process = Process(target=start_server, args=(server_file, port))
-            process.start()
-            processes.append(process)
-            time.sleep(1)  # Small delay between server starts
+            try:
+                process = start_server(server_file, port)
+                processes.append((server_file, process))
+            except Exception as e:
+                print(f"Error starting {server_file}: {e}")
+                continue
+            
+            # Move on as soon as the server is listening rather than after a fixed delay
+            if not _wait_port(port, process=process):
+                print(f"Warning: {server_file} is not accepting connections on port {port} yet")
         
         print("\nAll MCP servers started successfully!")
         print("Press Ctrl+C to stop all servers...")
         
-        # Wait for all processes
-        for process in processes:
-            process.join()
+        # Watch every child at once so a crash is reported as soon as it happens,
+        # rather than after the servers ahead of it in the list have exited
+        running = list(processes)
+        while running:
+            for entry in list(running):
+                server_file, process = entry
+                exit_code = process.poll()
+                if exit_code is not None:
+                    print(f"{server_file} exited with code {exit_code}")
+                    running.remove(entry)
+            time.sleep(0.2)
             
     except KeyboardInterrupt:
         print("\nShutting down all MCP servers...")
         
-        # Terminate all processes
-        for process in processes:
-            if process.is_alive():
+        # Signal every server first, then give them one shared grace period
+        for _, process in processes:
+            if process.poll() is None:
                 process.terminate()
-                process.join(timeout=5)
-                
-                if process.is_alive():
-                    process.kill()
+        
+        deadline = time.monotonic() + 5
+        for server_file, process in processes:
+            try:
+                process.wait(timeout=max(deadline - time.monotonic(), 0))
+            except subprocess.TimeoutExpired:
+                print(f"{server_file} did not stop in time, killing it")
+                process.kill()
+                process.wait()
         
         print("All servers stopped.")
 
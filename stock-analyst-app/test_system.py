@@ -4,19 +4,37 @@ Test script to verify all components of the Stock Analyst App
 """
 
 import requests
+from requests.adapters import HTTPAdapter
+import atexit
 import json
+import re
 import time
 import sys
 import os
+import threading
+from concurrent.futures import ThreadPoolExecutor, as_completed
 
 # Add the project root to Python path
 sys.path.append(os.path.dirname(os.path.abspath(__file__)))
 
-def test_mcp_servers():
-    """Test MCP servers are running and responding."""
-    print("Testing MCP Servers...")
-    
-    servers = [
+# One requests.Session per probe thread, so repeat probes reuse their localhost connection
+_thread_local = threading.local()
+
+def _session() -> requests.Session:
+    """This thread's HTTP session."""
+    session = getattr(_thread_local, 'session', None)
+    if session is None:
+        session = _thread_local.session = requests.Session()
+        # Small keep-alive pool; no automatic retries, so failures show up as-is
+        session.mount("http://", HTTPAdapter(pool_connections=4, pool_maxsize=8, max_retries=0))
+    return session
+
+# JSON-RPC probes for each MCP server, serialized once at import
+_JSON_HEADERS = {"Content-Type": "application/json"}
+
+_MCP_PAYLOADS = [
+    (name, url, json.dumps(payload).encode())
+    for name, url, payload in [
         ("Finance Server", "http://localhost:8001", {
             "jsonrpc": "2.0",
             "id": 1,
@@ -36,22 +54,95 @@ def test_mcp_servers():
             "params": {"symbol": "INFY", "period": "1mo"}
         })
     ]
+]
+
+_ANALYSIS_PAYLOAD = json.dumps({"stocks": ["INFY", "TCS"]}).encode()
+
+# Worker threads shared by every probe; their thread-local sessions stay warm between tests
+_PROBE_POOL = ThreadPoolExecutor(max_workers=8, thread_name_prefix="probe")
+atexit.register(_PROBE_POOL.shutdown, wait=False)
+
+# Bedrock test request, serialized once
+_BEDROCK_TEST_BODY = json.dumps({
+    "anthropic_version": "bedrock-2023-05-31",
+    "max_tokens": 100,
+    "temperature": 0.1,
+    "messages": [
+        {
+            "role": "user",
+            "content": "Hello, this is a test. Please respond with 'Test successful'."
+        }
+    ]
+})
+
+# Case-insensitive check for the expected reply, without lowercasing a copy of it
+_TEST_OK_RE = re.compile(r"test successful", re.IGNORECASE)
+
+# Bedrock client built once and reused; creating one loads botocore's service models from disk
+_bedrock_client = None
+
+def _get_bedrock():
+    """The shared bedrock-runtime client, created on first use."""
+    global _bedrock_client
+    if _bedrock_client is None:
+        import boto3
+        from botocore.config import Config as BotoConfig
+        from config import Config
+        
+        _bedrock_client = boto3.client(
+            'bedrock-runtime',
+            aws_access_key_id=Config.AWS_ACCESS_KEY_ID,
+            aws_secret_access_key=Config.AWS_SECRET_ACCESS_KEY,
+            region_name=Config.AWS_REGION,
+            # Keep-alive HTTPS connections pooled across invocations
+            config=BotoConfig(max_pool_connections=10, retries={"max_attempts": 2})
+        )
+    return _bedrock_client
+
+def _probe_mcp(name, url, body):
+    """Call one MCP server with a pre-encoded JSON-RPC body and return (name, status line)."""
+    try:
+        response = _session().post(url, data=body, headers=_JSON_HEADERS, timeout=10)
+        if response.status_code == 200:
+            data = response.json()
+            if 'result' in data:
+                return name, f"✓ {name}: OK"
+            return name, f"✗ {name}: Error - {data.get('error', 'Unknown error')}"
+        return name, f"✗ {name}: HTTP {response.status_code}"
+    except requests.exceptions.ConnectionError:
+        return name, f"✗ {name}: Connection refused (server not running?)"
+    except Exception as e:
+        return name, f"✗ {name}: {str(e)}"
+
+def _probe_flask(name, url, method):
+    """Call one Flask endpoint and return (name, status line)."""
+    try:
+        if method == "GET":
+            response = _session().get(url, timeout=10)
+        else:
+            response = _session().post(url, timeout=10)
+            
+        if response.status_code == 200:
+            return name, f"✓ {name}: OK"
+        return name, f"✗ {name}: HTTP {response.status_code}"
+    except requests.exceptions.ConnectionError:
+        return name, f"✗ {name}: Connection refused (Flask app not running?)"
+    except Exception as e:
+        return name, f"✗ {name}: {str(e)}"
+
+def _run_probes(probe, targets):
+    """Run probe(*target) for every target concurrently, printing each status as it arrives."""
+    futures = [_PROBE_POOL.submit(probe, *target) for target in targets]
+    for future in as_completed(futures):
+        name, status = future.result()
+        print(status)
+
+def test_mcp_servers():
+    """Test MCP servers are running and responding."""
+    print("Testing MCP Servers...")
     
-    for name, url, payload in servers:
-        try:
-            response = requests.post(url, json=payload, timeout=10)
-            if response.status_code == 200:
-                data = response.json()
-                if 'result' in data:
-                    print(f"✓ {name}: OK")
-                else:
-                    print(f"✗ {name}: Error - {data.get('error', 'Unknown error')}")
-            else:
-                print(f"✗ {name}: HTTP {response.status_code}")
-        except requests.exceptions.ConnectionError:
-            print(f"✗ {name}: Connection refused (server not running?)")
-        except Exception as e:
-            print(f"✗ {name}: {str(e)}")
+    # Probe all servers at once, so one slow server costs its own timeout rather than adding to the rest
+    _run_probes(_probe_mcp, _MCP_PAYLOADS)
 
 def test_flask_app():
     """Test Flask application endpoints."""
@@ -64,59 +155,53 @@ def test_flask_app():
         ("Market News", "http://localhost:5000/api/news", "GET"),
     ]
     
-    for name, url, method in endpoints:
-        try:
-            if method == "GET":
-                response = requests.get(url, timeout=10)
-            else:
-                response = requests.post(url, timeout=10)
-                
-            if response.status_code == 200:
-                print(f"✓ {name}: OK")
-            else:
-                print(f"✗ {name}: HTTP {response.status_code}")
-        except requests.exceptions.ConnectionError:
-            print(f"✗ {name}: Connection refused (Flask app not running?)")
-        except Exception as e:
-            print(f"✗ {name}: {str(e)}")
-
-def test_analysis_pipeline():
-    """Test the complete analysis pipeline."""
-    print("\nTesting Analysis Pipeline...")
-    
+    _run_probes(_probe_flask, endpoints)
+
+def _probe_analysis():
+    """POST one /analyze request and return the status lines to print."""
     try:
-        payload = {
-            "stocks": ["INFY", "TCS"]
-        }
-        
-        print("Running analysis (this may take a few minutes)...")
-        response = requests.post(
+        response = _session().post(
             "http://localhost:5000/analyze",
-            json=payload,
+            data=_ANALYSIS_PAYLOAD,
+            headers=_JSON_HEADERS,
             timeout=120  # 2 minutes timeout
         )
         
-        if response.status_code == 200:
-            data = response.json()
-            if data.get('status') == 'success':
-                recommendations = data.get('recommendations', [])
-                print(f"✓ Analysis Pipeline: OK ({len(recommendations)} recommendations)")
-                
-                # Display sample recommendation
-                if recommendations:
-                    rec = recommendations[0]
-                    print(f"  Sample: {rec.get('symbol')} - {rec.get('action')} ({rec.get('confidence', 0)*100:.1f}% confidence)")
-            else:
-                print(f"✗ Analysis Pipeline: {data.get('message', 'Unknown error')}")
-        else:
-            print(f"✗ Analysis Pipeline: HTTP {response.status_code}")
-            
+        if response.status_code != 200:
+            return [f"✗ Analysis Pipeline: HTTP {response.status_code}"]
+        
+        data = response.json()
+        if data.get('status') != 'success':
+            return [f"✗ Analysis Pipeline: {data.get('message', 'Unknown error')}"]
+        
+        recommendations = data.get('recommendations', [])
+        lines = [f"✓ Analysis Pipeline: OK ({len(recommendations)} recommendations)"]
+        
+        # Display sample recommendation
+        if recommendations:
+            rec = recommendations[0]
+            lines.append(f"  Sample: {rec.get('symbol')} - {rec.get('action')} ({rec.get('confidence', 0)*100:.1f}% confidence)")
+        return lines
+        
     except requests.exceptions.ConnectionError:
-        print("✗ Analysis Pipeline: Connection refused")
+        return ["✗ Analysis Pipeline: Connection refused"]
     except requests.exceptions.Timeout:
-        print("✗ Analysis Pipeline: Timeout (this is normal for first run)")
+        return ["✗ Analysis Pipeline: Timeout (this is normal for first run)"]
     except Exception as e:
-        print(f"✗ Analysis Pipeline: {str(e)}")
+        return [f"✗ Analysis Pipeline: {str(e)}"]
+
+def test_analysis_pipeline(pending=None):
+    """Test the complete analysis pipeline; pending is the Future of an already started _probe_analysis."""
+    print("\nTesting Analysis Pipeline...")
+    
+    if pending is None:
+        print("Running analysis (this may take a few minutes)...")
+        lines = _probe_analysis()
+    else:
+        lines = pending.result()
+    
+    for line in lines:
+        print(line)
 
 def test_database():
     """Test database connectivity."""
@@ -141,39 +226,22 @@ def test_aws_bedrock():
     print("\nTesting AWS Bedrock...")
     
     try:
-        import boto3
         from config import Config
         
-        client = boto3.client(
-            'bedrock-runtime',
-            aws_access_key_id=Config.AWS_ACCESS_KEY_ID,
-            aws_secret_access_key=Config.AWS_SECRET_ACCESS_KEY,
-            region_name=Config.AWS_REGION
-        )
+        client = _get_bedrock()
         
         # Test with a simple prompt
-        body = {
-            "anthropic_version": "bedrock-2023-05-31",
-            "max_tokens": 100,
-            "temperature": 0.1,
-            "messages": [
-                {
-                    "role": "user",
-                    "content": "Hello, this is a test. Please respond with 'Test successful'."
-                }
-            ]
-        }
-        
         response = client.invoke_model(
             modelId=Config.MODEL_ID,
-            body=json.dumps(body),
+            body=_BEDROCK_TEST_BODY,
             contentType='application/json'
         )
         
-        response_body = json.loads(response['body'].read())
+        # json.load reads the StreamingBody itself
+        response_body = json.load(response['body'])
         content = response_body.get('content', [{}])[0].get('text', '')
         
-        if 'test successful' in content.lower():
+        if _TEST_OK_RE.search(content):
             print("✓ AWS Bedrock: OK")
         else:
             print(f"✓ AWS Bedrock: Connected (response: {content[:50]}...)")
@@ -186,12 +254,15 @@ def main():
     print("Stock Analyst App - Component Test Suite")
     print("=" * 50)
     
+    # The analysis request can take minutes, so start it first and check the other components meanwhile
+    pipeline = _PROBE_POOL.submit(_probe_analysis)
+    
     # Test components
     test_database()
     test_aws_bedrock()
     test_mcp_servers()
     test_flask_app()
-    test_analysis_pipeline()
+    test_analysis_pipeline(pipeline)
     
     print("\n" + "=" * 50)
     print("Test Suite Complete!")